@@ -23,11 +23,18 @@ VERSIONTEXT=" Version: 3.x JSON 3d"
 import tkinter as tk
 from tkinter import simpledialog
 from tkinter import ttk, filedialog, messagebox
-import xml.etree.ElementTree as ET
+try:
+    from lxml import etree as ET
+    _HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _HAVE_LXML = False
+import xml.etree.ElementTree as StdET # DBDriver builds and reads stdlib elements
 import uuid
-import copy
+import zlib
 import os
 from xml.dom import minidom
+from xml.sax.saxutils import escape, quoteattr
 import datetime
 import csv
 import json
@@ -60,7 +67,88 @@ XSI = "http://www.w3.org/2001/XMLSchema-instance"
 ARCHIMATE = "http://www.archimatetool.com/archimate"
 ET.register_namespace("xsi", XSI)
 ET.register_namespace("archimate", ARCHIMATE)
+XSI_TYPE = "{%s}type" % XSI
 
+# Only the model root is namespaced in .archimate files; folders, elements and
+# documentation are unqualified. Folders sit directly under the model, elements
+# directly under (possibly nested) folders and documentation directly under elements.
+FOLDER_TAG = "folder"
+ELEMENT_TAG = "element"
+DOC_TAG = "documentation"
+
+if _HAVE_LXML:
+    # Dropping blank text lets lxml re-indent the tree when pretty printing
+    XML_PARSER = ET.XMLParser(remove_blank_text=True, huge_tree=True)
+else:
+    XML_PARSER = None
+
+
+def from_stdlib(element):
+    """Adopt an xml.etree element (e.g. from DBDriver) into the ET implementation in use."""
+    if not _HAVE_LXML or element is None:
+        return element
+    return ET.fromstring(StdET.tostring(element), XML_PARSER)
+
+
+def to_stdlib(element):
+    """Convert a model element to xml.etree for code that expects the stdlib API."""
+    if not _HAVE_LXML:
+        return element
+    return StdET.fromstring(ET.tostring(element))
+
+
+def pretty_xml_string(element):
+    """Indented XML text for the element, without an XML declaration."""
+    if _HAVE_LXML:
+        return ET.tostring(element, encoding='unicode', pretty_print=True).strip()
+    dom = minidom.parseString(ET.tostring(element, encoding='utf-8'))
+    lines = dom.toprettyxml(indent="  ").split('\n')
+    if lines and lines[0].startswith('<?xml'):
+        lines = lines[1:]
+    return '\n'.join(lines).strip()
+
+
+# Files at least this large are indexed while they are parsed instead of walked again afterwards
+STREAM_PARSE_MIN_BYTES = 1 << 20
+
+
+def element_snippet(xsi_type, attribs, doc_text=None):
+    """Serialised <element> (with optional documentation) for batched inserts.
+
+    attribs is a sequence of (name, value) pairs written in the order given, after xsi:type.
+    """
+    attr_text = "".join(f" {key}={quoteattr(value)}" for key, value in attribs)
+    head = f"<element xsi:type={quoteattr(xsi_type)}{attr_text}"
+    if doc_text:
+        return f"{head}><documentation>{escape(doc_text, {chr(13): '&#13;'})}</documentation></element>"
+    return head + "/>"
+
+
+def _element_row(element):
+    get = element.get
+    return (get("id"), get("name"), get(XSI_TYPE, ""), get("source"), get("target"))
+
+
+def element_rows(model):
+    """(id, name, xsi:type, source, target) for every element in the model, in document order."""
+    return [_element_row(el) for el in model.iter(ELEMENT_TAG)]
+
+
+def load_model_file(path):
+    """Parses an .archimate file and returns (ElementTree, element rows).
+
+    The whole tree is kept because it is edited and saved again, but large files are read
+    with iterparse so the element rows used by the lookup caches are collected in the same
+    pass as the parse rather than by separate walks afterwards.
+    """
+    if os.path.getsize(path) < STREAM_PARSE_MIN_BYTES:
+        tree = ET.parse(path, XML_PARSER)
+        return tree, element_rows(tree.getroot())
+
+    options = {"remove_blank_text": True, "huge_tree": True} if _HAVE_LXML else {}
+    context = ET.iterparse(path, events=("end",), **options)
+    rows = [_element_row(el) for _, el in context if el.tag == ELEMENT_TAG]
+    return ET.ElementTree(context.root), rows
 
 
 def get_build_version():
@@ -91,6 +179,11 @@ class ArchiIngestorApp:
         self.element_db = {}
         self.relationship_counts = {}
         self.relationship_map = {} # Cache for fast relationship lookups
+        self._folder_xml = {} # Treeview folder id -> XML folder awaiting lazy population
+        self._tree_filter = ""
+        self._search_after_id = None
+        self._paste_cache = None # (paste text, converted JSON) from the last parse
+        self._preview_after_id = None
         self.depth_var = tk.IntVar(value=1)
         self.viewer = ThreeDViewer(self) # Create an instance of the 3D viewer
 
@@ -114,15 +207,13 @@ class ArchiIngestorApp:
             messagebox.showinfo("Nothing to insert", "Paste Area is empty.")
             return
         
-        # Parse JSON content
+        # Parse JSON content and convert it to the expected format
         try:
-            json_data = json.loads(paste_content)
+            converted_data = self._parse_paste(paste_content)
         except json.JSONDecodeError as e:
             messagebox.showerror("JSON Error", f"Invalid JSON format:\n{e}")
             return
         
-        # Convert the JSON to the expected format
-        converted_data = self._convert_json_format(json_data)
         if not converted_data:
             return
 
@@ -130,6 +221,10 @@ class ArchiIngestorApp:
         created_elements = []
         relationships_to_create = []
         self.create_default_folders()
+        folder_by_name = self.folder_index()
+        new_id = generate_id
+        # (folder, XML snippet) pairs, parsed together and appended once the paste is processed
+        placements = []
 
         # Process elements from JSON
         for element in converted_data.get("elements", []):
@@ -151,19 +246,14 @@ class ArchiIngestorApp:
                 continue # Skip true duplicates (same name, same type)
 
             etype_full = f"archimate:{raw_type}"
-            new_el_id = generate_id()
-            folder = self.get_folder_for_type(raw_type)
+            new_el_id = new_id()
+            folder = self.get_folder_for_type(raw_type, folder_by_name)
 
             if folder is None:
                 print(f"Warning: Could not find or create a folder for type '{raw_type}'. Skipping element '{name}'.")
                 continue
 
-            attribs = {f"{{{XSI}}}type": etype_full, "name": name, "id": new_el_id}
-            new_el = ET.SubElement(folder, "element", attribs)
-            doc_text = element.get("description")
-            if doc_text:
-                doc_el = ET.SubElement(new_el, "documentation")
-                doc_el.text = doc_text
+            placements.append((folder, element_snippet(etype_full, (("name", name), ("id", new_el_id)), element.get("description"))))
             
             # Update the local name->ID cache immediately for subsequent relationship lookups
             name_lower = name.lower()
@@ -213,19 +303,13 @@ class ArchiIngestorApp:
             
             src_id, _ = src_info
             tgt_id, _ = tgt_info
-            rel_id = generate_id()
-            rel_attribs = {
-                f"{{{XSI}}}type": f"archimate:{rtype}",
-                "id": rel_id,
-                "source": src_id,
-                "target": tgt_id
-            }
-            rel_el = ET.SubElement(rel_folder, "element", rel_attribs)
-            if descr:
-                doc_el = ET.SubElement(rel_el, "documentation")
-                doc_el.text = descr
+            rel_id = new_id()
+            rel_attribs = (("id", rel_id), ("source", src_id), ("target", tgt_id))
+            placements.append((rel_folder, element_snippet(f"archimate:{rtype}", rel_attribs, descr)))
             relationships_to_create.append(f"{src_name} -> {rtype} -> {tgt_name}")
 
+        self._append_snippets(placements)
+
         if created_elements or relationships_to_create:
             self.dirty = True
 
@@ -337,13 +421,13 @@ class ArchiIngestorApp:
 
         # Get all folders by name for quick lookup
         folders_by_name = {}
-        for folder in self.model.findall("folder"):
+        for folder in self.model.findall(FOLDER_TAG):
             folders_by_name[folder.get("name")] = folder
 
         # Process all elements
-        for folder in self.model.findall("folder"):
-            for element in folder.findall("element"):
-                element_type_full = element.get(f"{{{XSI}}}type", "")
+        for folder in self.model.findall(FOLDER_TAG):
+            for element in folder.findall(ELEMENT_TAG):
+                element_type_full = element.get(XSI_TYPE, "")
                 if not element_type_full:
                     continue
                     
@@ -361,7 +445,7 @@ class ArchiIngestorApp:
                     if correct_folder_name not in folders_by_name:
                         # Create missing folder
                         folder_type = correct_folder_name.lower().replace(" & ", "_").replace(" ", "_")
-                        new_folder = ET.SubElement(self.model, "folder", {
+                        new_folder = ET.SubElement(self.model, FOLDER_TAG, {
                             "name": correct_folder_name, 
                             "id": generate_id(), 
                             "type": folder_type
@@ -398,7 +482,7 @@ class ArchiIngestorApp:
         all_relationships = self.find_all_relationships()
         
         for rel in all_relationships:
-            rel_type_full = rel.get(f"{{{XSI}}}type", "")
+            rel_type_full = rel.get(XSI_TYPE, "")
             rel_type = rel_type_full.replace("archimate:", "")
             source_id = rel.get("source")
             target_id = rel.get("target")
@@ -412,8 +496,8 @@ class ArchiIngestorApp:
                 removed_relationships.append(f"Removed '{rel_type}' with missing source/target elements")
                 continue
 
-            source_type_full = source_el.get(f"{{{XSI}}}type", "")
-            target_type_full = target_el.get(f"{{{XSI}}}type", "")
+            source_type_full = source_el.get(XSI_TYPE, "")
+            target_type_full = target_el.get(XSI_TYPE, "")
             source_type = source_type_full.replace("archimate:", "")
             target_type = target_type_full.replace("archimate:", "")
 
@@ -436,9 +520,9 @@ class ArchiIngestorApp:
 
     def _attempt_relationship_fix(self, rel, source_el, target_el, priority_list):
         """Attempt to fix an illegal relationship by trying alternatives or reversing direction."""
-        source_type = source_el.get(f"{{{XSI}}}type", "").replace("archimate:", "")
-        target_type = target_el.get(f"{{{XSI}}}type", "").replace("archimate:", "")
-        original_rel_type = rel.get(f"{{{XSI}}}type", "").replace("archimate:", "")
+        source_type = source_el.get(XSI_TYPE, "").replace("archimate:", "")
+        target_type = target_el.get(XSI_TYPE, "").replace("archimate:", "")
+        original_rel_type = rel.get(XSI_TYPE, "").replace("archimate:", "")
         
         source_name = source_el.get("name", "Unnamed")
         target_name = target_el.get("name", "Unnamed")
@@ -449,7 +533,7 @@ class ArchiIngestorApp:
             # Try relationships in priority order
             for rel_type in priority_list:
                 if rel_type in valid_same_dir:
-                    rel.set(f"{{{XSI}}}type", f"archimate:{rel_type}")
+                    rel.set(XSI_TYPE, f"archimate:{rel_type}")
                     return f"Fixed: Changed '{original_rel_type}' to '{rel_type}' for '{source_name}' → '{target_name}'"
 
         # Strategy 2: Try reverse direction with alternative types
@@ -461,7 +545,7 @@ class ArchiIngestorApp:
                     # Swap source and target
                     rel.set("source", target_el.get("id"))
                     rel.set("target", source_el.get("id"))
-                    rel.set(f"{{{XSI}}}type", f"archimate:{rel_type}")
+                    rel.set(XSI_TYPE, f"archimate:{rel_type}")
                     return f"Fixed: Reversed and changed '{original_rel_type}' to '{rel_type}' for '{target_name}' → '{source_name}'"
 
         return None
@@ -497,7 +581,7 @@ class ArchiIngestorApp:
         for rel in self.find_all_relationships():
             source_id = rel.get("source")
             target_id = rel.get("target")
-            rel_type = rel.get(f"{{{XSI}}}type", "")
+            rel_type = rel.get(XSI_TYPE, "")
             
             # Create a unique key for this relationship
             rel_key = (source_id, target_id, rel_type)
@@ -511,7 +595,7 @@ class ArchiIngestorApp:
         for rel in relationships_to_remove:
             source_el = self.find_element_by_id(rel.get("source"))
             target_el = self.find_element_by_id(rel.get("target"))
-            rel_type = rel.get(f"{{{XSI}}}type", "").replace("archimate:", "")
+            rel_type = rel.get(XSI_TYPE, "").replace("archimate:", "")
             
             source_name = source_el.get("name", "Unnamed") if source_el else "Unknown"
             target_name = target_el.get("name", "Unnamed") if target_el else "Unknown"
@@ -564,7 +648,7 @@ class ArchiIngestorApp:
         if self.model is None or element_to_remove is None:
             return False
         
-        for folder in self.model.findall("folder"):
+        for folder in self.model.findall(FOLDER_TAG):
             try:
                 folder.remove(element_to_remove)
                 return True
@@ -684,50 +768,59 @@ class ArchiIngestorApp:
         """Updates the preview text based on the JSON content in the paste area."""
         content = self.paste_text.get("1.0", "end").strip()
         if not content:
-            self.preview_text.config(state="normal")
-            self.preview_text.delete("1.0", "end")
-            self.preview_text.insert("1.0", "No staged content.")
-            self.preview_text.config(state="disabled")
+            self._set_preview_text("No staged content.")
             return
         
         try:
-            json_data = json.loads(content)
-            converted_data = self._convert_json_format(json_data)
+            converted_data = self._parse_paste(content)
             preview_lines = []
+            add_line = preview_lines.append
             
             # Process elements
             elements = converted_data.get("elements", [])
             if elements:
-                preview_lines.append("Elements to add:")
+                add_line("Elements to add:")
                 for element in elements:
-                    preview_lines.append(f"  - {element['type']}: {element['name']}")
+                    add_line(f"  - {element['type']}: {element['name']}")
                     if element.get("description"):
-                        preview_lines.append(f"    Description: {element['description']}")
+                        add_line(f"    Description: {element['description']}")
             
             # Process relationships
             relationships = converted_data.get("relationships", [])
             if relationships:
                 if elements:
-                    preview_lines.append("")  # Add spacing
-                preview_lines.append("Relationships to add:")
+                    add_line("")  # Add spacing
+                add_line("Relationships to add:")
                 for rel in relationships:
-                    preview_lines.append(f"  - {rel['source']} -> {rel['type']} -> {rel['target']}")
+                    add_line(f"  - {rel['source']} -> {rel['type']} -> {rel['target']}")
                     if rel.get("description"):
-                        preview_lines.append(f"    Description: {rel['description']}")
+                        add_line(f"    Description: {rel['description']}")
             
             if not preview_lines:
-                preview_lines.append("No valid elements or relationships found.")
+                add_line("No valid elements or relationships found.")
             
-            self.preview_text.config(state="normal")
-            self.preview_text.delete("1.0", "end")
-            self.preview_text.insert("1.0", "\n".join(preview_lines))
-            self.preview_text.config(state="disabled")
+            self._set_preview_text("\n".join(preview_lines))
             
         except json.JSONDecodeError:
-            self.preview_text.config(state="normal")
-            self.preview_text.delete("1.0", "end")
-            self.preview_text.insert("1.0", "Invalid JSON format")
-            self.preview_text.config(state="disabled")
+            self._set_preview_text("Invalid JSON format")
+
+    def _parse_paste(self, content):
+        """Returns the converted paste JSON, re-parsing only when the text has changed.
+
+        The preview and the insert both read the paste area, so the parse done for the
+        last preview is reused when the user commits the same text.
+        """
+        cached = self._paste_cache
+        if cached is None or cached[0] != content:
+            cached = self._paste_cache = (content, self._convert_json_format(json.loads(content)))
+        return cached[1]
+
+    def _set_preview_text(self, text):
+        """Replaces the read-only preview contents in a single insert."""
+        self.preview_text.config(state="normal")
+        self.preview_text.delete("1.0", "end")
+        self.preview_text.insert("1.0", text)
+        self.preview_text.config(state="disabled")
 
     def _validate_json_structure(self, json_data):
         """Validate the basic structure of the JSON data."""
@@ -855,6 +948,7 @@ class ArchiIngestorApp:
         self.treeview = ttk.Treeview(tree_frame)
         self.treeview.pack(fill="both", expand=True, side="left")
         self.treeview.bind("<<TreeviewSelect>>", self.on_tree_select)
+        self.treeview.bind("<<TreeviewOpen>>", self._lazy_load_folder)
         tree_scroll = ttk.Scrollbar(left_frame, orient="vertical", command=self.treeview.yview)
         tree_scroll.pack(side="left", fill="y")
         self.treeview.configure(yscrollcommand=tree_scroll.set)
@@ -1030,8 +1124,8 @@ class ArchiIngestorApp:
 
         # --- Get entity types from the current model ---
         entity_types = set()
-        for el in self.model.findall(".//element"):
-            el_type_full = el.get(f"{{{XSI}}}type", "")
+        for el in self.model.iter(ELEMENT_TAG):
+            el_type_full = el.get(XSI_TYPE, "")
             if el_type_full and "Relationship" not in el_type_full:
                 entity_types.add(el_type_full.replace("archimate:", ""))
         
@@ -1116,12 +1210,12 @@ class ArchiIngestorApp:
             if not selected_type:
                 return
 
-            for el in self.model.findall(".//element"):
-                el_type_full = el.get(f"{{{XSI}}}type", "")
+            for el in self.model.iter(ELEMENT_TAG):
+                el_type_full = el.get(XSI_TYPE, "")
                 if el_type_full.replace("archimate:", "") == selected_type:
                     el_id = el.get("id")
                     name = el.get("name", "")
-                    doc_el = el.find("documentation")
+                    doc_el = el.find(DOC_TAG)
                     description = doc_el.text if doc_el is not None else ""
                     catalog_tree.insert("", "end", iid=el_id, values=(name, description))
 
@@ -1163,10 +1257,10 @@ class ArchiIngestorApp:
             # Update the XML model
             element_to_update.set("name", new_name)
             
-            doc_el = element_to_update.find("documentation")
+            doc_el = element_to_update.find(DOC_TAG)
             if new_desc:
                 if doc_el is None:
-                    doc_el = ET.SubElement(element_to_update, "documentation")
+                    doc_el = ET.SubElement(element_to_update, DOC_TAG)
                 doc_el.text = new_desc
             elif doc_el is not None:
                 # Remove documentation element if description is cleared
@@ -1196,8 +1290,8 @@ class ArchiIngestorApp:
         if self.model is None:
             return []
         inventory = []
-        for el in self.model.findall(".//element"):
-            etype = el.get(f"{{{XSI}}}type", "").replace("archimate:", "")
+        for el in self.model.iter(ELEMENT_TAG):
+            etype = el.get(XSI_TYPE, "").replace("archimate:", "")
             name = el.get("name", "")
             if name:
                 inventory.append(f"{etype} | {name}")
@@ -1209,7 +1303,7 @@ class ArchiIngestorApp:
             return []
         triples = []
         for rel in self.find_all_relationships():
-            rel_type = rel.get(f"{{{XSI}}}type", "").replace("archimate:", "")
+            rel_type = rel.get(XSI_TYPE, "").replace("archimate:", "")
             src = self.element_db_by_id.get(rel.get("source"), {}).get("name", "")
             tgt = self.element_db_by_id.get(rel.get("target"), {}).get("name", "")
             if src and tgt:
@@ -1308,11 +1402,18 @@ class ArchiIngestorApp:
             messagebox.showinfo("Gemini Response", f"Could not parse JSON from response. Raw response:\n\n{response_text}")
 
     def on_paste_modified(self, event=None):
-        """Called when the paste text area is modified."""
+        """Called when the paste text area is modified; the preview is rebuilt once edits pause."""
         if self.paste_text.edit_modified():
-            self.update_staged_preview()
-            self.update_button_states()
-            self.paste_text.edit_modified(False)
+            if self._preview_after_id:
+                self.root.after_cancel(self._preview_after_id)
+            self._preview_after_id = self.root.after(200, self._do_preview_update)
+
+    def _do_preview_update(self):
+        self._preview_after_id = None
+        self.update_staged_preview()
+        self.update_button_states()
+        # Re-arm <<Modified>> only now, so a burst of edits schedules a single update
+        self.paste_text.edit_modified(False)
 
 
     def quick_add_to_paste(self):
@@ -1370,7 +1471,7 @@ class ArchiIngestorApp:
         if not path:
             return
         try:
-            self.tree = ET.parse(path)
+            self.tree, rows = load_model_file(path)
             self.model = self.tree.getroot()
             self.filepath = path
             self.dirty = False # Freshly loaded file is not dirty
@@ -1382,9 +1483,9 @@ class ArchiIngestorApp:
             self.db_manager = None
             self.db_filepath = None
 
-            self.build_element_database()
-            self.build_relationship_map()
-            self.calculate_relationship_counts()
+            self.build_element_database(rows)
+            self.build_relationship_map(rows)
+            self.calculate_relationship_counts(rows)
             self.save_history()
             self.status_var.set(f"Loaded: {os.path.basename(path)}")
             self.refresh_tree()
@@ -1402,16 +1503,12 @@ class ArchiIngestorApp:
         if not path:
             return
         try:
-            xml_str = ET.tostring(self.model, encoding='utf-8').decode()
-            dom = minidom.parseString(xml_str)
-            pretty_xml = dom.toprettyxml(indent="  ")
-            lines = pretty_xml.split('\n')
-            if lines[0].startswith('<?xml'):
-                lines = lines[1:]
-            pretty_xml = '\n'.join(lines).strip()
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write('<?xml version=\'1.0\' encoding=\'utf-8\'?>\n')
-                f.write(pretty_xml)
+            if _HAVE_LXML:
+                ET.ElementTree(self.model).write(path, encoding='utf-8', xml_declaration=True, pretty_print=True)
+            else:
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write('<?xml version=\'1.0\' encoding=\'utf-8\'?>\n')
+                    f.write(pretty_xml_string(self.model))
             self.dirty = False # Saved, so no longer dirty
             messagebox.showinfo("Saved", f"Saved to {path}")
             self.status_var.set(f"Saved XML: {os.path.basename(path)}")
@@ -1456,7 +1553,7 @@ class ArchiIngestorApp:
             if self.db_manager is None or self.db_filepath != db_path:
                 self.db_manager = ArchiMateDB(db_path)
 
-            conflicts = self.db_manager.import_from_xml(self.model)
+            conflicts = self.db_manager.import_from_xml(to_stdlib(self.model))
 
             if conflicts:
                 conflict_msg = "Could not save due to version conflicts (model was updated by another user):\n"
@@ -1479,7 +1576,7 @@ class ArchiIngestorApp:
         if not self.db_manager:
             return
         
-        self.model = self.db_manager.export_to_xml()
+        self.model = from_stdlib(self.db_manager.export_to_xml())
         if self.model is None:
             messagebox.showerror("DB Error", "Failed to construct model from database.")
             return
@@ -1501,7 +1598,7 @@ class ArchiIngestorApp:
         self.update_button_states()
 
     # --- Element Database Management ---
-    def build_element_database(self):
+    def build_element_database(self, rows=None):
         if self.model is None:
             return
         self.element_db.clear()
@@ -1509,11 +1606,7 @@ class ArchiIngestorApp:
         name_type_combinations = {}
         warnings = []
 
-        for element in self.model.findall(".//element"):
-            name = element.get("name")
-            element_id = element.get("id")
-            element_type = element.get(f"{{{XSI}}}type", "")
-            
+        for element_id, name, element_type, _, _ in (rows if rows is not None else element_rows(self.model)):
             if name and element_id:
                 name_lower = name.lower()
                 # Handle name collisions by storing a list of elements for each name
@@ -1534,24 +1627,24 @@ class ArchiIngestorApp:
             unique_warnings = "\n".join(sorted(list(set(warnings))))
             print("--- Build Element Database Warnings --- \n" + unique_warnings)
 
-    def build_relationship_map(self):
+    def build_relationship_map(self, rows=None):
         """Builds a cache for quick lookup of relationships for each element."""
         self.relationship_map = {}
         if self.model is None:
             return
+        if rows is None:
+            rows = element_rows(self.model)
         
         # Initialize map for all non-relationship elements
-        for el in self.model.findall(".//element"):
-            el_id = el.get("id")
-            etype = el.get(f"{{{XSI}}}type", "")
+        for el_id, _, etype, _, _ in rows:
             if el_id and "Relationship" not in etype:
                 self.relationship_map[el_id] = []
 
         # Populate map with relationships
-        for rel in self.find_all_relationships():
-            source_id = rel.get("source")
-            target_id = rel.get("target")
-            rel_type = rel.get(f"{{{XSI}}}type", "").split(":")[-1]
+        for _, _, etype, source_id, target_id in rows:
+            if not etype.endswith("Relationship"):
+                continue
+            rel_type = etype.split(":")[-1]
 
             if source_id and source_id in self.relationship_map and target_id:
                 self.relationship_map[source_id].append({'id': target_id, 'type': rel_type, 'direction': 'out'})
@@ -1559,25 +1652,23 @@ class ArchiIngestorApp:
             if target_id and target_id in self.relationship_map and source_id:
                 self.relationship_map[target_id].append({'id': source_id, 'type': rel_type, 'direction': 'in'})
 
-    def calculate_relationship_counts(self):
+    def calculate_relationship_counts(self, rows=None):
         """Calculates incoming and outgoing relationship counts for each element."""
         if self.model is None:
             self.relationship_counts = {}
             return
+        if rows is None:
+            rows = element_rows(self.model)
 
         counts = {}
         # Initialize all elements with zero counts
-        for el in self.model.findall(".//element"):
-            el_id = el.get("id")
+        for el_id, _, _, _, _ in rows:
             if el_id:
                 counts[el_id] = {'in': 0, 'out': 0}
 
         # Iterate through relationships and increment counts
-        for rel in self.model.findall(".//element"):
-            rel_type = rel.get(f"{{{XSI}}}type", "")
+        for _, _, rel_type, source_id, target_id in rows:
             if rel_type and rel_type.split(":")[-1] in RELATIONSHIP_TYPES:
-                source_id = rel.get("source")
-                target_id = rel.get("target")
                 if source_id and source_id in counts:
                     counts[source_id]['out'] += 1
                 if target_id and target_id in counts:
@@ -1587,33 +1678,78 @@ class ArchiIngestorApp:
 
     # --- TreeView Methods ---
     def refresh_tree(self, filter_text=""):
-        self.treeview.delete(*self.treeview.get_children())
-        if self.model is None:
-            return
-        
-        filter_text = filter_text.lower()
-
-        root_label = f"archimate:model | {self.model.get('name','')}"
-        root_id = self.treeview.insert("", "end", text=root_label, open=True, values=("model",))
-        for folder in self.model.findall("folder"):
-            fname = folder.get("name", "Folder")
-            ftype = folder.get("type", "")
-            folder_id = self.treeview.insert(root_id, "end", text=f"{fname} ({ftype})", values=("folder", folder.get("id","")), open=bool(filter_text))
-            for el in folder.findall("element"):
-                etype_full = el.get(f"{{{XSI}}}type", "")
-                etype = etype_full.split(":")[-1] if ":" in etype_full else etype_full
-                name = el.get("name","")
-                el_id = el.get("id","")
-                if filter_text and filter_text not in name.lower():
-                    continue
+        # Unmap the widget while it is rebuilt so Tk lays it out once, not after every insert
+        mapped = self.treeview.winfo_manager() == "pack"
+        if mapped:
+            self.treeview.pack_forget()
+        try:
+            self.treeview.delete(*self.treeview.get_children())
+            if self.model is None:
+                return
+
+            filter_text = filter_text.lower()
 
-                counts = self.relationship_counts.get(el_id, {'in': 0, 'out': 0})
-                el_label = f"[{counts['in']}] > {name} < [{counts['out']}]" if name else f"{etype}"
-                el_node = self.treeview.insert(folder_id, "end", text=el_label, values=("element", el_id))
+            root_label = f"archimate:model | {self.model.get('name','')}"
+            root_id = self.treeview.insert("", "end", text=root_label, open=True, values=("model",))
+
+            # Folder contents are only inserted when a folder is first opened (see _lazy_load_folder);
+            # a search filter opens every folder, so the walk is done eagerly in that case
+            self._folder_xml = {}
+            self._tree_filter = filter_text
+            self._add_tree_children(self.model, root_id, eager=bool(filter_text))
+        finally:
+            if mapped:
+                self.treeview.pack(fill="both", expand=True, side="left")
         self.update_xml_output_panel()
 
+    def _add_tree_children(self, parent_xml, parent_id, eager=False):
+        """Inserts the direct children of an XML folder (or the model) under parent_id."""
+        insert = self.treeview.insert
+        counts_by_id = self.relationship_counts
+        no_counts = {'in': 0, 'out': 0}
+        filter_text = self._tree_filter
+
+        for child in parent_xml:
+            tag = child.tag
+            if tag == FOLDER_TAG:
+                fname = child.get("name", "Folder")
+                ftype = child.get("type", "")
+                folder_id = insert(parent_id, "end", text=f"{fname} ({ftype})", values=("folder", child.get("id","")), open=eager)
+                if eager:
+                    self._add_tree_children(child, folder_id, eager=True)
+                elif len(child):
+                    # Placeholder row so Tk draws the expand arrow; replaced on first open
+                    insert(folder_id, "end", text="…", tags=("placeholder",))
+                    self._folder_xml[folder_id] = child
+            elif tag == ELEMENT_TAG and parent_xml is not self.model:
+                name = child.get("name","")
+                if filter_text and filter_text not in name.lower():
+                    continue
+                el_id = child.get("id","")
+                counts = counts_by_id.get(el_id, no_counts)
+                if name:
+                    el_label = f"[{counts['in']}] > {name} < [{counts['out']}]"
+                else:
+                    el_label = child.get(XSI_TYPE, "").rpartition(":")[2]
+                insert(parent_id, "end", text=el_label, values=("element", el_id))
+
+    def _lazy_load_folder(self, event=None):
+        """Populates a folder row the first time it is expanded."""
+        folder_id = self.treeview.focus()
+        folder = self._folder_xml.pop(folder_id, None)
+        if folder is None:
+            return
+        self.treeview.delete(*self.treeview.get_children(folder_id))
+        self._add_tree_children(folder, folder_id)
+
     def search_tree(self, *args):
-        """Filters the treeview based on the search entry."""
+        """Filters the treeview based on the search entry, once typing pauses."""
+        if self._search_after_id:
+            self.root.after_cancel(self._search_after_id)
+        self._search_after_id = self.root.after(150, self._run_search)
+
+    def _run_search(self):
+        self._search_after_id = None
         self.refresh_tree(self.search_var.get())
 
     def on_tree_select(self, event):
@@ -1638,17 +1774,41 @@ class ArchiIngestorApp:
                     self.details_text.insert("end", f"{ctag}: {ctext}\n")
         self.details_text.config(state="disabled")
 
+    def _append_snippets(self, placements):
+        """Parses [(folder, element snippet)] in a single call and appends each element to its folder."""
+        if not placements:
+            return
+        xml_text = (f'<fragment xmlns:xsi="{XSI}" xmlns:archimate="{ARCHIMATE}">'
+                    + "".join(snippet for _, snippet in placements) + "</fragment>")
+        fragment = ET.fromstring(xml_text.encode("utf-8"))
+        for (folder, _), element in zip(placements, list(fragment)):
+            folder.append(element)
+
     # --- Folder Management ---
-    def get_folder_for_type(self, element_type):
+    def get_folder_for_type(self, element_type, folder_by_name=None):
+        """Returns the folder for an element type, creating it if missing.
+
+        Bulk callers pass a name -> folder index (see folder_index) so each lookup is
+        a dict hit rather than a scan over the model's folders; new folders are added to it.
+        """
         short = element_type.split(":")[-1]
         folder_name = FOLDER_MAP.get(short, "Other")
-        for folder in self.model.findall("folder"):
-            if folder.get("name") == folder_name:
-                return folder
-        return self.create_folder(folder_name, folder_name.lower())
+        if folder_by_name is None:
+            folder_by_name = self.folder_index()
+        folder = folder_by_name.get(folder_name)
+        if folder is None:
+            folder = folder_by_name[folder_name] = self.create_folder(folder_name, folder_name.lower())
+        return folder
+
+    def folder_index(self):
+        """Maps top-level folder names to folders, keeping the first on duplicate names."""
+        folder_by_name = {}
+        for folder in self.model.findall(FOLDER_TAG):
+            folder_by_name.setdefault(folder.get("name"), folder)
+        return folder_by_name
 
     def get_or_create_relations_folder(self):
-        for folder in self.model.findall("folder"):
+        for folder in self.model.findall(FOLDER_TAG):
             if folder.get("type") == "relations":
                 return folder
         return self.create_folder("Relations", "relations")
@@ -1656,7 +1816,7 @@ class ArchiIngestorApp:
     def create_folder(self, name, folder_type):
         folder_id = generate_id()
         attribs = {"name": name, "id": folder_id, "type": folder_type}
-        return ET.SubElement(self.model, "folder", attribs)
+        return ET.SubElement(self.model, FOLDER_TAG, attribs)
 
     def create_default_folders(self):
         folders = [
@@ -1670,14 +1830,11 @@ class ArchiIngestorApp:
             ("Relations", "relations"),
             ("Views", "diagrams")
         ]
+        existing_types = {folder.get("type") for folder in self.model.findall(FOLDER_TAG)}
         for name, ftype in folders:
-            found = False
-            for folder in self.model.findall("folder"):
-                if folder.get("type") == ftype:
-                    found = True
-                    break
-            if not found:
+            if ftype not in existing_types:
                 self.create_folder(name, ftype)
+                existing_types.add(ftype)
 
     # --- XML Output ---
     def update_xml_output_panel(self):
@@ -1689,13 +1846,7 @@ class ArchiIngestorApp:
             self.xml_output_text.insert("end", "(no model loaded)")
             self.xml_output_text.config(state="disabled")
             return
-        xml_str = ET.tostring(self.model, encoding='utf-8')
-        dom = minidom.parseString(xml_str)
-        pretty_xml = dom.toprettyxml(indent="  ")
-        lines = pretty_xml.split('\n')
-        if lines and lines[0].startswith('<?xml'):
-            lines = lines[1:]
-        pretty_xml = '\n'.join(lines).strip()
+        pretty_xml = pretty_xml_string(self.model)
         self.xml_output_text.config(state="normal")
         self.xml_output_text.delete("1.0", "end")
         self.xml_output_text.insert("end", pretty_xml)
@@ -1705,7 +1856,8 @@ class ArchiIngestorApp:
     def save_history(self):
         if self.model is None:
             return
-        self.history.append(copy.deepcopy(self.model))
+        # Compressed XML bytes are far smaller than a live tree copy and serialise in C
+        self.history.append(zlib.compress(ET.tostring(self.model, encoding='utf-8'), 1))
         if len(self.history) > 40:
             self.history.pop(0)
 
@@ -1714,7 +1866,7 @@ class ArchiIngestorApp:
             messagebox.showinfo("Undo", "No undo history.")
             return
         snapshot = self.history.pop()
-        self.model = snapshot
+        self.model = ET.fromstring(zlib.decompress(snapshot), XML_PARSER)
         self.tree = ET.ElementTree(self.model)
         self.dirty = True # Undoing is a change
         self.build_element_database()
@@ -1736,9 +1888,9 @@ class ArchiIngestorApp:
         if self.model is None:
             return []
         relationships = []
-        for folder in self.model.findall("folder"):
-            for element in folder.findall("element"):
-                if element.get(f"{{{XSI}}}type", "").endswith("Relationship"):
+        for folder in self.model.findall(FOLDER_TAG):
+            for element in folder.findall(ELEMENT_TAG):
+                if element.get(XSI_TYPE, "").endswith("Relationship"):
                     relationships.append(element)
         return relationships
 
@@ -1791,15 +1943,15 @@ class ArchiIngestorApp:
             else:
                 # --- XML File Mode ---
                 element_details = {}
-                for folder in self.model.findall("folder"):
+                for folder in self.model.findall(FOLDER_TAG):
                     folder_name = folder.get("name", "Unknown")
-                    for el in folder.findall(".//element"):
+                    for el in folder.iter(ELEMENT_TAG):
                         el_id = el.get("id")
-                        doc_el = el.find("documentation")
+                        doc_el = el.find(DOC_TAG)
                         element_details[el_id] = {
                             "id": el_id,
                             "name": el.get("name", ""),
-                            "type": el.get(f"{{{XSI}}}type", "").replace("archimate:", ""),
+                            "type": el.get(XSI_TYPE, "").replace("archimate:", ""),
                             "folder": folder_name,
                             "desc": doc_el.text if doc_el is not None else ""
                         }
@@ -1818,9 +1970,9 @@ class ArchiIngestorApp:
                     if not source or not target:
                         continue
 
-                    rel_doc = rel.find("documentation")
+                    rel_doc = rel.find(DOC_TAG)
                     rel_desc = rel_doc.text if rel_doc is not None else ""
-                    rel_type = rel.get(f"{{{XSI}}}type", "").replace("archimate:", "")
+                    rel_type = rel.get(XSI_TYPE, "").replace("archimate:", "")
 
                     # Row for the source element
                     rows.append([
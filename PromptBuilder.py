@@ -17,6 +17,7 @@ class PromptGenerator:
         self.current_prompt_index = 0
         self.prompts = []
         self.selected_domains = set()
+        self._status_flush_pending = False
         
         self.create_widgets()
         self.bind_shortcuts()
@@ -678,6 +679,13 @@ class PromptGenerator:
     def update_status(self, message):
         """Update status bar message"""
         self.status_var.set(message)
+        # One idle-time refresh however many messages arrive before it runs
+        if not self._status_flush_pending:
+            self._status_flush_pending = True
+            self.root.after_idle(self._flush_status)
+    
+    def _flush_status(self):
+        self._status_flush_pending = False
         self.root.update_idletasks()
     
     def bind_shortcuts(self):
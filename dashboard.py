@@ -7,6 +7,7 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.collections import LineCollection
 import matplotlib
 matplotlib.use('TkAgg')
 from pathlib import Path
@@ -14,12 +15,58 @@ import json
 import time
 import math
 import numpy as np
-from collections import defaultdict, deque
+import queue
+import traceback
+import heapq
+import io
+import base64
+import importlib.util
+from html import escape
+from collections import defaultdict, deque, Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import networkx as nx
 
 from graphml_core import GraphMLArchimateModel
 from networkx_analyzer import ArchimateAnalyzer
 from visualization_engine import GraphVisualizer
 
+@lru_cache(maxsize=None)
+def _get_match_kernel():
+    """Compile the numba search kernel on first use - None when numba isn't installed"""
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+    
+    @njit(cache=True, parallel=True)
+    def match_mask(blob, offsets, needle):
+        """Substring search of needle within each record of a byte blob"""
+        count = offsets.shape[0] - 1
+        width = needle.shape[0]
+        mask = np.zeros(count, dtype=np.bool_)
+        for i in prange(count):
+            start = offsets[i]
+            last = offsets[i + 1] - width
+            first = needle[0]
+            for pos in range(start, last + 1):
+                if blob[pos] != first:
+                    continue
+                hit = True
+                for k in range(1, width):
+                    if blob[pos + k] != needle[k]:
+                        hit = False
+                        break
+                if hit:
+                    mask[i] = True
+                    break
+        return mask
+    
+    return match_mask
+
+# Largest number of nodes drawn by the force-directed and radial views
+MAX_VIZ_NODES = 500
+
 class EnhancedDigitalTwinDashboard:
     def __init__(self, root):
         self.root = root
@@ -31,8 +78,35 @@ class EnhancedDigitalTwinDashboard:
         self.analyzer = None
         self.visualizer = None
         self.impact_scores = {}
+        self._significant_impacts = {}
         self.focused_node = None
         
+        # Background loading and exports - keeps the Tk event loop responsive
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._load_progress = queue.Queue()
+        self._loading = False
+        self._load_future = None
+        
+        # Signature of the last completed render, used to skip redundant redraws
+        self._last_render_key = None
+        
+        # Full draws of the embedded figure so far, and the snapshot PNG cached against them
+        self._figure_generation = 0
+        self._last_export_key = None
+        self._last_export_png = None
+        
+        # Filtered impact scores, memoized per (filter version, impact run)
+        self._filter_version = 0
+        self._impact_version = 0
+        self._filtered_impact_cache = None
+        
+        # Last few filtered subgraph views, keyed by (filter version, impact version)
+        self._cached_view = lru_cache(maxsize=4)(self._build_filtered_view)
+        
+        # Importance radio buttons are created once and relabelled on refresh
+        self._imp_radios = []
+        self._last_imp_labels = None
+        
         # Enhanced color scheme
         self.colors = {
             'primary': '#2c3e50',
@@ -70,6 +144,9 @@ class EnhancedDigitalTwinDashboard:
             'critical': (0.0, 1.0)
         }
         
+        # Column-oriented node cache used by the vectorised filters (needs colors and filters)
+        self._refresh_node_cache()
+        
         self.setup_gui()
     
     def setup_gui(self):
@@ -116,6 +193,9 @@ class EnhancedDigitalTwinDashboard:
                                    font=('Arial', 11), bg=self.colors['card_bg'], fg=self.colors['text_light'])
         self.model_status.pack(anchor=tk.W, pady=5)
         
+        self.load_progress = ttk.Progressbar(load_frame, mode='determinate', maximum=100)
+        self.load_progress.pack(fill=tk.X, pady=(0, 5))
+        
         load_btn_frame = tk.Frame(load_frame, bg=self.colors['card_bg'])
         load_btn_frame.pack(fill=tk.X, pady=10)
         
@@ -322,13 +402,12 @@ class EnhancedDigitalTwinDashboard:
         if not hasattr(self, 'importance_options_frame') or not self.model.graph.nodes():
             return
         
-        # Clear existing options
-        for widget in self.importance_options_frame.winfo_children():
-            widget.destroy()
-        
         # Get current importance scores from filtered elements
         elements = self.get_filtered_elements()
         if not elements:
+            for rb in self._imp_radios:
+                rb.pack_forget()
+            self._last_imp_labels = None
             return
         
         importance_scores = [data.get('importance_score', 0) for _, data in elements]
@@ -349,7 +428,7 @@ class EnhancedDigitalTwinDashboard:
             'critical': (high_threshold, 1.0)
         }
         
-        # Create radio buttons with dynamic labels
+        # Dynamic labels for the radio buttons
         importance_options = [
             (f"All Levels ({len(elements)} elements)", "all"),
             (f"⭐ Medium+ (≥{low_threshold:.2f})", "medium"),
@@ -357,11 +436,25 @@ class EnhancedDigitalTwinDashboard:
             (f"⭐⭐⭐ Critical (≥{high_threshold:.2f})", "critical")
         ]
         
-        for text, value in importance_options:
-            rb = tk.Radiobutton(self.importance_options_frame, text=text, variable=self.importance_var,
-                              value=value, command=self.on_filter_change, 
-                              bg=self.colors['card_bg'], font=('Arial', 8))
-            rb.pack(anchor=tk.W, pady=1)
+        # Skip the Tk round-trips when the labels haven't changed
+        labels = tuple(text for text, _ in importance_options)
+        if labels == self._last_imp_labels:
+            return
+        self._last_imp_labels = labels
+        
+        # Create the radio buttons once, then only relabel them
+        if not self._imp_radios:
+            for text, value in importance_options:
+                rb = tk.Radiobutton(self.importance_options_frame, text=text, variable=self.importance_var,
+                                  value=value, command=self.on_filter_change, 
+                                  bg=self.colors['card_bg'], font=('Arial', 8))
+                rb.pack(anchor=tk.W, pady=1)
+                self._imp_radios.append(rb)
+        else:
+            for rb, text in zip(self._imp_radios, labels):
+                rb.configure(text=text)
+                if not rb.winfo_manager():
+                    rb.pack(anchor=tk.W, pady=1)
     
     def setup_visualization_panel(self, parent):
         """Setup enhanced visualization panel"""
@@ -395,7 +488,7 @@ class EnhancedDigitalTwinDashboard:
         quick_action_frame = tk.Frame(viz_control_frame, bg=self.colors['card_bg'])
         quick_action_frame.pack(fill=tk.X, pady=8)
         
-        tk.Button(quick_action_frame, text="🔄 Refresh View", command=self.update_visualization,
+        tk.Button(quick_action_frame, text="🔄 Refresh View", command=lambda: self.update_visualization(force=True),
                  bg=self.colors['success'], fg='white', font=('Arial', 9)).pack(side=tk.LEFT, padx=2)
         
         tk.Button(quick_action_frame, text="💾 Export HTML", command=self.export_interactive,
@@ -408,6 +501,7 @@ class EnhancedDigitalTwinDashboard:
         self.fig, self.ax = plt.subplots(figsize=(10, 8), dpi=100)
         self.canvas = FigureCanvasTkAgg(self.fig, viz_canvas_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.canvas.mpl_connect('draw_event', self._on_canvas_draw)
         
         # Add navigation toolbar
         from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
@@ -455,6 +549,11 @@ class EnhancedDigitalTwinDashboard:
                      bg=self.colors['primary'], fg='white', font=('Arial', 10),
                      width=18).pack(side=tk.LEFT)
             
+            if command == self.run_centrality_analysis:
+                self.approx_centrality_var = tk.BooleanVar(value=False)
+                tk.Checkbutton(btn_frame, text="Fast approximate", variable=self.approx_centrality_var,
+                              bg=self.colors['card_bg'], font=('Arial', 8)).pack(side=tk.LEFT, padx=(8, 0))
+            
             tk.Label(btn_frame, text=description, font=('Arial', 8),
                     bg=self.colors['card_bg'], fg=self.colors['text_light']).pack(side=tk.LEFT, padx=8)
         
@@ -507,9 +606,118 @@ class EnhancedDigitalTwinDashboard:
     # FILTERING AND BROWSING - IMPROVED WORKFLOW
     # =========================================================================
     
+    def _refresh_node_cache(self):
+        """Rebuild the column arrays used for filtering from the model graph"""
+        nodes = self.model.graph.nodes
+        self._node_ids = np.array(list(nodes), dtype=object)
+        self._node_names = [nodes[n].get('name', '') for n in self._node_ids]
+        self._node_types = [nodes[n].get('type', '') for n in self._node_ids]
+        layers = [nodes[n].get('layer', '') for n in self._node_ids]
+        
+        # Layers are stored as small integer codes into a string table
+        self._layer_vocab = {name: i for i, name in enumerate(sorted(set(layers)))}
+        self._layer_code = np.fromiter((self._layer_vocab[l] for l in layers),
+                                       dtype=np.uint8, count=len(layers))
+        
+        # Colour lookup by layer name and by layer code
+        self._layer_to_color = {layer: self.colors.get(layer.lower(), self.colors['other'])
+                                for layer in self._layer_vocab}
+        self._layer_colors = np.array(list(self._layer_to_color.values()), dtype=object)
+        self._importance = np.fromiter((nodes[n].get('importance_score', 0) for n in self._node_ids),
+                                       dtype=np.float32, count=len(self._node_ids))
+        self._centrality = np.fromiter((nodes[n].get('centrality', 0) for n in self._node_ids),
+                                       dtype=np.float32, count=len(self._node_ids))
+        
+        # Edge endpoints as indices into the node columns
+        index = {node_id: i for i, node_id in enumerate(self._node_ids)}
+        edges = list(self.model.graph.edges(data='weight', default=0.5))
+        self._node_index = index
+        self._edge_src = np.fromiter((index[u] for u, _, _ in edges), dtype=np.int32, count=len(edges))
+        self._edge_dst = np.fromiter((index[v] for _, v, _ in edges), dtype=np.int32, count=len(edges))
+        self._edge_width = np.fromiter((w * 2 for _, _, w in edges), dtype=np.float32, count=len(edges))
+        
+        # Overview statistics, recomputed lazily for the new model
+        self._layer_counts_cache = None
+        self._avg_centrality_cache = None
+        self._cached_view.cache_clear()
+        
+        # Centrality analysis results per mode (exact / approximate)
+        self._centrality_cache = {}
+        
+        # Force layout and its persistent artists are rebuilt lazily per model
+        self._force_xy = None
+        self._node_pc = None
+        self._edge_lc = None
+        self._force_labels = []
+        self._force_bg = None  # Saved static layer of the force view - everything but nodes and labels
+        self._force_edge_mask = None
+        
+        # Lower-cased "name\0type\0" records packed into one blob for live search
+        records = [f"{name}\0{elem_type}\0".lower().encode('utf-8')
+                   for name, elem_type in zip(self._node_names, self._node_types)]
+        self._search_blob = b''.join(records)
+        self._search_offsets = np.zeros(len(records) + 1, dtype=np.int32)
+        np.cumsum([len(r) for r in records], out=self._search_offsets[1:])
+        
+        self._recompute_filter_masks()
+    
+    def _search_mask_for(self, query):
+        """Boolean mask of nodes whose name or type contains query"""
+        needle = query.lower().encode('utf-8')
+        if b'\0' in needle:
+            return np.zeros(len(self._node_ids), dtype=bool)
+        
+        match_mask = _get_match_kernel()
+        if match_mask is not None:
+            return match_mask(np.frombuffer(self._search_blob, dtype=np.uint8),
+                               self._search_offsets, np.frombuffer(needle, dtype=np.uint8))
+        
+        # Fallback: C-level bytes.find over the blob, skipping to the next record on a hit
+        mask = np.zeros(len(self._node_ids), dtype=bool)
+        blob, offsets = self._search_blob, self._search_offsets
+        pos = blob.find(needle)
+        while pos != -1:
+            record = int(np.searchsorted(offsets, pos, side='right')) - 1
+            mask[record] = True
+            pos = blob.find(needle, offsets[record + 1])
+        return mask
+    
+    def _recompute_filter_masks(self):
+        """Resolve the current filters into per-node boolean masks once per filter change"""
+        filters = self.current_filters
+        count = len(self._node_ids)
+        
+        # Layer filter on the uint8 codes
+        layer_filter = filters['layers']
+        if "all" in layer_filter:
+            self._layer_mask = np.ones(count, dtype=bool)
+        else:
+            codes = np.array([self._layer_vocab[l] for l in layer_filter if l in self._layer_vocab],
+                             dtype=np.uint8)
+            self._layer_mask = np.isin(self._layer_code, codes)
+        
+        # Importance filter
+        self._imp_mask = self._importance >= np.float32(filters['importance_threshold'])
+        
+        # Search filter
+        search_query = filters['search_query']
+        if search_query:
+            self._search_mask = self._search_mask_for(search_query)
+        else:
+            self._search_mask = np.ones(count, dtype=bool)
+        
+        self._passing_mask = self._layer_mask & self._imp_mask & self._search_mask
+        self._passing_set = set(self._node_ids[self._passing_mask])
+        self._filter_version += 1
+    
+    def _filter_mask(self):
+        """Boolean mask over the node cache for the current filters"""
+        return self._passing_mask
+    
     def on_search(self, event=None):
         """Handle search with live filtering"""
         self.current_filters['search_query'] = self.search_var.get()
+        self._recompute_filter_masks()
         self.update_tree_display()
         self.update_importance_options()  # Update importance options when search changes
     
@@ -517,6 +725,7 @@ class EnhancedDigitalTwinDashboard:
         """Clear search box"""
         self.search_var.set("")
         self.current_filters['search_query'] = ""
+        self._recompute_filter_masks()
         self.update_tree_display()
         self.update_importance_options()
     
@@ -540,6 +749,7 @@ class EnhancedDigitalTwinDashboard:
         # Get importance threshold from dynamic ranges
         importance_key = self.importance_var.get()
         self.current_filters['importance_threshold'] = self.importance_ranges[importance_key][0]
+        self._recompute_filter_masks()
         
         self.update_tree_display()
     
@@ -599,11 +809,8 @@ class EnhancedDigitalTwinDashboard:
     
     def get_filtered_elements(self):
         """Get elements filtered by current criteria"""
-        elements = []
-        
-        for node_id, data in self.model.graph.nodes(data=True):
-            if self.passes_current_filters(node_id):
-                elements.append((node_id, data))
+        nodes = self.model.graph.nodes
+        elements = [(node_id, nodes[node_id]) for node_id in self._node_ids[self._filter_mask()]]
         
         # Sort elements
         sort_key = self.current_filters['sort_by']
@@ -622,30 +829,7 @@ class EnhancedDigitalTwinDashboard:
     
     def passes_current_filters(self, node_id):
         """Check if a node passes all current filters"""
-        if node_id not in self.model.graph:
-            return False
-        
-        node_data = self.model.graph.nodes[node_id]
-        
-        # Apply layer filter
-        layer_filter = self.current_filters['layers']
-        if "all" not in layer_filter and node_data.get('layer') not in layer_filter:
-            return False
-        
-        # Apply importance filter
-        importance = node_data.get('importance_score', 0)
-        if importance < self.current_filters['importance_threshold']:
-            return False
-        
-        # Apply search filter
-        search_query = self.current_filters['search_query'].lower()
-        if search_query:
-            name = node_data.get('name', '').lower()
-            elem_type = node_data.get('type', '').lower()
-            if search_query not in name and search_query not in elem_type:
-                return False
-        
-        return True
+        return node_id in self._passing_set
     
     def preview_element(self, element_id):
         """Preview element details without setting focus"""
@@ -659,19 +843,20 @@ class EnhancedDigitalTwinDashboard:
             )
             
             # Show details in results
-            details = f"🔍 PREVIEW: {node_data.get('name', 'Unknown')}\n"
-            details += f"Type: {node_data.get('type', 'Unknown')} | Layer: {node_data.get('layer', 'Unknown')}\n"
-            details += f"Importance: {node_data.get('importance_score', 0):.3f} | Centrality: {node_data.get('centrality', 0):.3f}\n"
-            details += f"AI Category: {node_data.get('ai_category', 'Unknown')}\n\n"
+            details = [
+                f"🔍 PREVIEW: {node_data.get('name', 'Unknown')}\n",
+                f"Type: {node_data.get('type', 'Unknown')} | Layer: {node_data.get('layer', 'Unknown')}\n",
+                f"Importance: {node_data.get('importance_score', 0):.3f} | Centrality: {node_data.get('centrality', 0):.3f}\n",
+                f"AI Category: {node_data.get('ai_category', 'Unknown')}\n\n"
+            ]
             
             # Show metrics if available
             metrics = node_data.get('metrics', {})
             if metrics:
-                details += "Metrics:\n"
-                for metric, value in metrics.items():
-                    details += f"  • {metric}: {value}\n"
+                details.append("Metrics:\n")
+                details.extend(f"  • {metric}: {value}\n" for metric, value in metrics.items())
             
-            self.show_results(details)
+            self.show_results(''.join(details))
     
     def set_focus_element(self, element_id):
         """Set focus element for analysis"""
@@ -692,7 +877,7 @@ class EnhancedDigitalTwinDashboard:
     def clear_focus(self):
         """Clear current focus"""
         self.focused_node = None
-        self.impact_scores = {}
+        self._set_impact_scores({})
         self.focus_label.config(text="No focus element selected", fg=self.colors['text_light'])
         self.update_visualization()
         self.show_results("Focus cleared. Select an element and run impact analysis.")
@@ -701,27 +886,49 @@ class EnhancedDigitalTwinDashboard:
     # VISUALIZATION METHODS - WITH CONSISTENT FILTERING
     # =========================================================================
     
+    def _prepare_axes(self):
+        """Clear the shared axes for reuse; rebuild it only if a multi-panel plot replaced it"""
+        self._last_render_key = None
+        if len(self.fig.axes) == 1 and self.ax is self.fig.axes[0]:
+            self.ax.clear()
+        else:
+            self.fig.clf()
+            self.ax = self.fig.add_subplot(111)
+        return self.ax
+    
+    def _use_shared_figure(self):
+        """Make the embedded figure current so visualizer plots land on it"""
+        self._last_render_key = None
+        plt.figure(self.fig.number)
+    
     def on_viz_type_change(self):
         """Handle visualization type change"""
         self.update_visualization()
     
-    def update_visualization(self):
+    def update_visualization(self, force=False):
         """Update visualization based on current type and focus - WITH CONSISTENT FILTERING"""
         if not self.visualizer:
             self.show_visualization_placeholder()
             return
         
+        # Nothing observable changed since the last render - keep what's on screen
+        render_key = (id(self.model), self.viz_type.get(), self.focused_node,
+                      self._filter_version, self._impact_version)
+        if not force and render_key == self._last_render_key:
+            return
+        
         try:
-            self.fig.clf()
+            self._use_shared_figure()
             
             viz_type = self.viz_type.get()
+            blitted = False
             
             # ALWAYS use filtered impact scores for ALL visualization types
             impact_for_viz = self.get_filtered_impact_scores() if self.impact_scores else None
             
             if viz_type == "force":
                 # For force-directed layout, we need to create a subgraph with filtered nodes
-                self.plot_filtered_force_directed(impact_for_viz)
+                blitted = self.plot_filtered_force_directed(impact_for_viz)
             elif viz_type == "layered":
                 # For layered layout, use filtered impact scores
                 self.plot_filtered_layered_layout(impact_for_viz)
@@ -739,105 +946,203 @@ class EnhancedDigitalTwinDashboard:
                 # Radial view already uses filtered scores correctly
                 self.plot_radial_impact(impact_for_viz)
             
-            self.canvas.draw()
+            if not blitted:
+                self.canvas.draw_idle()
+            self._last_render_key = render_key
             
         except Exception as e:
             messagebox.showerror("Error", f"Visualization failed: {str(e)}")
-            import traceback
             traceback.print_exc()
             self.show_visualization_placeholder()
     
     def plot_filtered_force_directed(self, impact_scores):
-        """Create force-directed layout with filtered nodes only"""
-        if not impact_scores:
-            # If no impact scores, show all filtered elements
-            filtered_elements = self.get_filtered_elements()
-            if not filtered_elements:
-                self.show_no_data_message()
-                return
-            
-            # Create a subgraph with only filtered elements
-            filtered_nodes = [elem_id for elem_id, _ in filtered_elements]
-            subgraph = self.model.graph.subgraph(filtered_nodes)
-            
-            # Create a temporary visualizer for the subgraph
-            temp_model = GraphMLArchimateModel()
-            temp_model.graph = subgraph
-            temp_visualizer = GraphVisualizer(temp_model)
-            temp_visualizer.plot_force_directed_layout()
+        """Force-directed layout with filtered nodes only, updating persistent artists in place
+        
+        Returns True when the update was blitted onto the screen already (only the nodes and
+        labels changed), False when the canvas still needs a full draw.
+        """
+        if impact_scores:
+            # Impact scores are already filtered by get_filtered_impact_scores()
+            mask = np.zeros(len(self._node_ids), dtype=bool)
+            mask[[self._node_index[n] for n in impact_scores if n in self._node_index]] = True
         else:
-            # Use impact scores but ensure we're only showing filtered nodes
-            filtered_impact = {}
-            for node, score in impact_scores.items():
-                if node in self.model.graph and self.passes_current_filters(node):
-                    filtered_impact[node] = score
-            
-            if not filtered_impact:
-                self.show_no_data_message()
-                return
-            
-            # Create subgraph with filtered nodes that have impact scores
-            filtered_nodes = list(filtered_impact.keys())
-            subgraph = self.model.graph.subgraph(filtered_nodes)
-            
-            temp_model = GraphMLArchimateModel()
-            temp_model.graph = subgraph
-            temp_visualizer = GraphVisualizer(temp_model)
-            temp_visualizer.plot_force_directed_layout(filtered_impact)
+            mask = self._filter_mask()
+        
+        if not mask.any():
+            self.show_no_data_message()
+            return False
+        
+        # Cap very large selections to the top nodes by impact (or importance)
+        total = int(mask.sum())
+        if total > MAX_VIZ_NODES:
+            candidates = np.flatnonzero(mask)
+            if impact_scores:
+                ranking = np.array([impact_scores.get(n, 0) for n in self._node_ids[candidates]])
+            else:
+                ranking = self._importance[candidates]
+            mask = np.zeros_like(mask)
+            mask[candidates[np.argsort(-ranking, kind='stable')[:MAX_VIZ_NODES]]] = True
+        
+        if self._force_xy is None:
+            # Normally precomputed by the load worker (ForceAtlas2 on large models)
+            pos = self.visualizer.force_layout()
+            self._force_xy = np.array([pos[n] for n in self._node_ids], dtype=float)
+        
+        if self._node_pc is None or self._node_pc not in self.ax.collections:
+            self._create_force_artists()
+        
+        nodes = self.model.graph.nodes
+        visible_ids = self._node_ids[mask]
+        
+        # Node sizes based on impact or importance
+        if impact_scores:
+            scores = np.array([impact_scores.get(n, 0) for n in visible_ids])
+            sizes = scores * 3000 + 100
+            important = visible_ids[scores > 0.1]
+        else:
+            sizes = self._importance[mask] * 2000 + 100
+            important = visible_ids[self._importance[mask] > 0.7]
+        
+        # Node colors by layer code
+        colors = self._layer_colors[self._layer_code[mask]].tolist()
+        
+        xy = self._force_xy[mask]
+        self._node_pc.set_offsets(xy)
+        self._node_pc.set_sizes(sizes)
+        self._node_pc.set_facecolors(colors)
+        
+        # Edges with both endpoints visible
+        edge_mask = mask[self._edge_src] & mask[self._edge_dst]
+        title = "Force-Directed Layout"
+        if total > MAX_VIZ_NODES:
+            title += f" (showing top {MAX_VIZ_NODES} of {total} nodes)"
+        
+        # Same edges and title: only the animated nodes and labels changed, so they can be
+        # blitted over the saved background instead of redrawing the whole figure
+        blit = (self._force_bg is not None and title == self.ax.get_title()
+                and np.array_equal(edge_mask, self._force_edge_mask))
+        if not blit:
+            self._edge_lc.set_segments(np.stack([self._force_xy[self._edge_src[edge_mask]],
+                                                 self._force_xy[self._edge_dst[edge_mask]]], axis=1))
+            self._edge_lc.set_linewidths(self._edge_width[edge_mask])
+            self._force_edge_mask = edge_mask
+            self.ax.set_title(title)
+        
+        # Labels for important nodes only
+        for label in self._force_labels:
+            label.remove()
+        self._force_labels = [
+            self.ax.text(*self._force_xy[self._node_index[n]], nodes[n].get('name', n)[:15],
+                         ha='center', va='center', fontsize=8, animated=True)
+            for n in important
+        ]
+        
+        if blit:
+            self.canvas.restore_region(self._force_bg)
+            self._draw_force_nodes()
+            # Whole figure, not ax.bbox - labels of nodes near the edge overhang the axes
+            self.canvas.blit(self.fig.bbox)
+        return blit
+    
+    def _draw_force_nodes(self):
+        """Draw the force view's animated artists (nodes and labels) onto the canvas"""
+        self.ax.draw_artist(self._node_pc)
+        for label in self._force_labels:
+            self.ax.draw_artist(label)
+    
+    def _on_canvas_draw(self, event):
+        """After every full draw (resize, pan/zoom, draw_idle) save the force view's static
+        layer and draw its animated nodes on top - they're skipped by normal draws"""
+        if self.canvas.is_saving():
+            return
+        self._figure_generation += 1
+        if self._node_pc is not None and self._node_pc in self.ax.collections:
+            self._force_bg = self.canvas.copy_from_bbox(self.fig.bbox)
+            self._draw_force_nodes()
+        else:
+            self._force_bg = None
+    
+    def _create_force_artists(self):
+        """Create the node/edge collections reused by the force-directed view"""
+        ax = self._prepare_axes()
+        self._edge_lc = LineCollection([], colors='k', alpha=0.3, zorder=1)
+        ax.add_collection(self._edge_lc)
+        self._node_pc = ax.scatter([], [], s=[], alpha=0.8, zorder=2, animated=True)
+        self._force_labels = []
+        self._force_bg = None
+        self._force_edge_mask = None
+        
+        # Fixed limits from the full layout so filter changes don't rescale the view
+        (x0, y0), (x1, y1) = self._force_xy.min(axis=0), self._force_xy.max(axis=0)
+        pad_x, pad_y = max(0.1, (x1 - x0) * 0.1), max(0.1, (y1 - y0) * 0.1)
+        ax.set_xlim(x0 - pad_x, x1 + pad_x)
+        ax.set_ylim(y0 - pad_y, y1 + pad_y)
+        ax.set_autoscale_on(False)
+        ax.axis('off')
+        
+        # Add legend for layers
+        from matplotlib.patches import Patch
+        legend_elements = [Patch(facecolor=self.colors[layer.lower()], label=layer)
+                           for layer in ('Motivation', 'Strategy', 'Business', 'Application',
+                                         'Technology', 'Implementation', 'Other')]
+        ax.legend(handles=legend_elements, loc='upper right')
     
     def plot_filtered_layered_layout(self, impact_scores):
         """Create layered layout with filtered nodes only"""
-        if not impact_scores:
-            # If no impact scores, show all filtered elements
-            filtered_elements = self.get_filtered_elements()
-            if not filtered_elements:
-                self.show_no_data_message()
-                return
-            
-            filtered_nodes = [elem_id for elem_id, _ in filtered_elements]
-            subgraph = self.model.graph.subgraph(filtered_nodes)
-            
-            temp_model = GraphMLArchimateModel()
-            temp_model.graph = subgraph
-            temp_visualizer = GraphVisualizer(temp_model)
-            temp_visualizer.plot_layered_layout()
+        # Filtered view of the model graph, reused while filters and impacts are unchanged
+        view = self._cached_view(self._filter_version, self._impact_version)
+        if view is None:
+            self.show_no_data_message()
+            return
+        
+        with self.visualizer.using_graph(view):
+            self.visualizer.plot_layered_layout(impact_scores or None)
+    
+    def _build_filtered_view(self, filter_version, impact_version):
+        """Subgraph view for the current filter/impact state (versions are the cache key)"""
+        impact_scores = self.get_filtered_impact_scores()
+        if impact_scores:
+            # Impact scores are already filtered by get_filtered_impact_scores()
+            filtered_set = set(impact_scores)
         else:
-            # Use impact scores but ensure we're only showing filtered nodes
-            filtered_impact = {}
-            for node, score in impact_scores.items():
-                if node in self.model.graph and self.passes_current_filters(node):
-                    filtered_impact[node] = score
-            
-            if not filtered_impact:
-                self.show_no_data_message()
-                return
-            
-            filtered_nodes = list(filtered_impact.keys())
-            subgraph = self.model.graph.subgraph(filtered_nodes)
-            
-            temp_model = GraphMLArchimateModel()
-            temp_model.graph = subgraph
-            temp_visualizer = GraphVisualizer(temp_model)
-            temp_visualizer.plot_layered_layout(filtered_impact)
+            # If no impact scores, show all filtered elements
+            filtered_set = self._passing_set
+        
+        return self._filtered_view(filtered_set) if filtered_set else None
+    
+    def _filtered_view(self, filtered_set):
+        """Induced subgraph view, picking the lookup strategy from the filtered fraction"""
+        graph = self.model.graph
+        ratio = len(filtered_set) / max(1, graph.number_of_nodes())
+        
+        if ratio < 0.1:
+            # Small selection - subgraph iterates the node set itself
+            return graph.subgraph(filtered_set)
+        if ratio > 0.5:
+            # Large selection - only filter out the minority of excluded nodes
+            excluded = set(graph) - filtered_set
+            return nx.restricted_view(graph, excluded, [])
+        return nx.subgraph_view(graph, filter_node=filtered_set.__contains__)
     
     def plot_radial_impact(self, impact_scores):
         """Create a proper radial impact visualization (from old code)"""
         if not self.focused_node or not impact_scores:
             return
         
-        # Clear the figure
-        self.fig.clf()
-        ax = self.fig.add_subplot(111)
+        # Reuse the shared axes
+        ax = self._prepare_axes()
+        
+        nodes = self.model.graph.nodes
         
         # Get focus element data
-        focus_data = self.model.graph.nodes[self.focused_node]
+        focus_data = nodes[self.focused_node]
         focus_name = focus_data.get('name', self.focused_node)
         
         # Prepare data for radial plot - ALREADY FILTERED by get_filtered_impact_scores()
         nodes_to_plot = []
         for node_id, score in impact_scores.items():
-            if score > 0.01 and node_id != self.focused_node:  # Only significant impacts
-                node_data = self.model.graph.nodes[node_id]
+            if node_id != self.focused_node:
+                node_data = nodes[node_id]
                 nodes_to_plot.append({
                     'id': node_id,
                     'name': node_data.get('name', 'Unknown'),
@@ -852,8 +1157,10 @@ class EnhancedDigitalTwinDashboard:
             ax.axis('off')
             return
         
-        # Sort by impact score
+        # Sort by impact score, keeping only the strongest impacts on very large runs
         nodes_to_plot.sort(key=lambda x: x['score'], reverse=True)
+        total_impacted = len(nodes_to_plot)
+        nodes_to_plot = nodes_to_plot[:MAX_VIZ_NODES]
         
         # Create radial positions
         n_nodes = len(nodes_to_plot)
@@ -863,79 +1170,83 @@ class EnhancedDigitalTwinDashboard:
         ax.scatter(0, 0, s=500, c='red', alpha=0.8, label='Focus')
         ax.text(0, 0, '★', ha='center', va='center', fontsize=16, color='white', fontweight='bold')
         
-        # Plot impacted elements in circle
+        # Plot impacted elements in circle - positions, sizes and colors as arrays
         radius = 1.0
-        for i, node in enumerate(nodes_to_plot):
-            angle = angles[i]
-            x = radius * np.cos(angle)
-            y = radius * np.sin(angle)
-            
-            # Size based on impact score
-            size = 100 + (node['score'] * 400)
-            
-            # Color based on layer
-            color = self.colors.get(node['layer'].lower(), self.colors['other'])
-            
-            # Plot node
-            ax.scatter(x, y, s=size, c=color, alpha=0.7, edgecolors='white', linewidth=1)
-            
-            # Draw connection line
-            ax.plot([0, x], [0, y], 'gray', alpha=0.3, linewidth=0.5)
-            
-            # Add label
-            label_radius = 1.2
-            label_x = label_radius * np.cos(angle)
-            label_y = label_radius * np.sin(angle)
-            
-            # Truncate name for display
-            display_name = node['name'][:15] + '...' if len(node['name']) > 15 else node['name']
-            ax.text(label_x, label_y, display_name, 
+        xs = radius * np.cos(angles)
+        ys = radius * np.sin(angles)
+        scores = np.array([node['score'] for node in nodes_to_plot])
+        sizes = 100 + scores * 400  # Size based on impact score
+        codes = self._layer_code[[self._node_index[node['id']] for node in nodes_to_plot]]
+        colors = self._layer_colors[codes].tolist()
+        
+        # Connection lines as a single collection, nodes as a single scatter
+        spokes = np.stack([np.zeros((n_nodes, 2)), np.column_stack([xs, ys])], axis=1)
+        ax.add_collection(LineCollection(spokes, colors='gray', alpha=0.3, linewidths=0.5))
+        ax.scatter(xs, ys, s=sizes, c=colors, alpha=0.7, edgecolors='white', linewidth=1)
+        
+        # Label text, positions and rotations prepared up front
+        names = [node['name'][:15] + '...' if len(node['name']) > 15 else node['name']
+                 for node in nodes_to_plot]
+        degrees = np.degrees(angles)
+        rotations = np.where((angles > np.pi/2) & (angles < 3*np.pi/2), degrees, degrees + 180)
+        label_radius = 1.2
+        label_xs, label_ys = label_radius * np.cos(angles), label_radius * np.sin(angles)
+        score_xs, score_ys = (radius + 0.1) * np.cos(angles), (radius + 0.1) * np.sin(angles)
+        
+        for i in range(n_nodes):
+            ax.text(label_xs[i], label_ys[i], names[i], 
                    ha='center', va='center', fontsize=8, 
-                   rotation=angle*180/np.pi if angle > np.pi/2 and angle < 3*np.pi/2 else angle*180/np.pi + 180,
-                   rotation_mode='anchor')
-            
-            # Add impact score
-            score_x = (radius + 0.1) * np.cos(angle)
-            score_y = (radius + 0.1) * np.sin(angle)
-            ax.text(score_x, score_y, f'{node["score"]:.2f}', 
+                   rotation=rotations[i], rotation_mode='anchor')
+            ax.text(score_xs[i], score_ys[i], f'{scores[i]:.2f}', 
                    ha='center', va='center', fontsize=7, color='red', fontweight='bold')
         
         ax.set_xlim(-1.5, 1.5)
         ax.set_ylim(-1.5, 1.5)
         ax.set_aspect('equal')
         ax.axis('off')
-        ax.set_title(f'Radial Impact View: {focus_name}', fontsize=14, fontweight='bold', pad=20)
+        title = f'Radial Impact View: {focus_name}'
+        if total_impacted > MAX_VIZ_NODES:
+            title += f' (top {MAX_VIZ_NODES} of {total_impacted})'
+        ax.set_title(title, fontsize=14, fontweight='bold', pad=20)
         
         # Add legend for layers
         layers_present = set(node['layer'] for node in nodes_to_plot)
         legend_elements = []
         for layer in layers_present:
-            color = self.colors.get(layer.lower(), self.colors['other'])
+            color = self._layer_to_color.get(layer, self.colors['other'])
             legend_elements.append(plt.Line2D([0], [0], marker='o', color='w', 
                                             markerfacecolor=color, markersize=8, label=layer))
         
         if legend_elements:
             ax.legend(handles=legend_elements, loc='upper right', bbox_to_anchor=(1.1, 1.1))
     
+    def _set_impact_scores(self, scores):
+        """Store a new impact run along with its significant (>= 0.01) subset"""
+        self.impact_scores = scores
+        self._significant_impacts = {node: score for node, score in scores.items() if score >= 0.01}
+        self._filtered_impact_cache = None
+        self._impact_version += 1
+    
     def get_filtered_impact_scores(self):
-        """Get impact scores filtered by current thresholds - ENHANCED"""
+        """Get impact scores filtered by current thresholds - memoized per filter/impact state"""
         if not self.impact_scores:
             return {}
         
-        filtered_scores = {}
+        cached = self._filtered_impact_cache
+        if cached and cached[0] == self._filter_version and cached[1] is self.impact_scores:
+            return cached[2]
         
-        for node, score in self.impact_scores.items():
-            if score >= 0.01:  # Only significant impacts
-                # Also check node passes all current filters
-                if self.passes_current_filters(node):
-                    filtered_scores[node] = score
+        # Also check node passes all current filters
+        passing = self._passing_set
+        filtered_scores = {node: score for node, score in self._significant_impacts.items()
+                           if node in passing}
         
+        self._filtered_impact_cache = (self._filter_version, self.impact_scores, filtered_scores)
         return filtered_scores
     
     def show_no_data_message(self):
         """Show message when no data matches filters"""
-        self.fig.clf()
-        ax = self.fig.add_subplot(111)
+        ax = self._prepare_axes()
         ax.text(0.5, 0.5, 
                 "No elements match current filters\n\n"
                 "Try adjusting:\n"
@@ -948,8 +1259,7 @@ class EnhancedDigitalTwinDashboard:
     
     def show_visualization_placeholder(self):
         """Show visualization placeholder"""
-        self.fig.clf()
-        self.ax = self.fig.add_subplot(111)
+        self._prepare_axes()
         self.ax.text(0.5, 0.5, 
                     "Enterprise Architecture Visualizer\n\n"
                     "1. Load an Archimate model\n"
@@ -960,7 +1270,7 @@ class EnhancedDigitalTwinDashboard:
                     ha='center', va='center', transform=self.ax.transAxes, 
                     fontsize=12, wrap=True)
         self.ax.axis('off')
-        self.canvas.draw()
+        self.canvas.draw_idle()
     
     def show_overview_placeholder(self):
         """Show overview placeholder"""
@@ -981,40 +1291,101 @@ class EnhancedDigitalTwinDashboard:
     # =========================================================================
     
     def load_model(self):
-        """Load Archimate XML model"""
+        """Load Archimate XML model on a worker thread"""
+        if self._loading:
+            return
+        
         file_path = filedialog.askopenfilename(
             title="Select Archimate XML File",
             filetypes=[("XML files", "*.xml"), ("All files", "*.*")]
         )
         
         if file_path:
-            try:
-                self.model_status.config(text="Loading model...")
-                self.root.update()
+            self._loading = True
+            self.model_status.config(text="Loading model...")
+            self.load_progress['value'] = 0
+            
+            # Finished from _poll_load_progress - Tk may only be called from this thread
+            self._load_future = self._executor.submit(self._load_model_worker, Path(file_path))
+            self._poll_load_progress()
+    
+    def _load_model_worker(self, path):
+        """Parse the model and build analyzer/visualizer off the Tk thread"""
+        report = self._load_progress.put
+        
+        report((10, "Parsing XML..."))
+        model = GraphMLArchimateModel()
+        if not model.load_archimate_xml(path):
+            return {'success': False}
+        
+        report((70, "Preparing analyzer..."))
+        analyzer = ArchimateAnalyzer(model)
+        visualizer = GraphVisualizer(model)
+        
+        # The force view's layout is O(N^2) per step on big models - do it here, not on first show
+        report((80, "Computing layout..."))
+        visualizer.force_layout()
+        
+        report((90, "Updating displays..."))
+        return {'success': True, 'model': model,
+                'analyzer': analyzer, 'visualizer': visualizer}
+    
+    def _poll_load_progress(self):
+        """Drain progress messages posted by the load worker and pick up its result"""
+        try:
+            while True:
+                value, message = self._load_progress.get_nowait()
+                self.load_progress['value'] = value
+                self.model_status.config(text=message)
+        except queue.Empty:
+            pass
+        
+        if not self._loading:
+            return
+        future = self._load_future
+        if future is not None and future.done():
+            self._load_future = None
+            self._on_model_loaded(future)
+        else:
+            self.root.after(50, self._poll_load_progress)
+    
+    def _on_model_loaded(self, future):
+        """Apply a finished load on the Tk thread"""
+        self._loading = False
+        self._poll_load_progress()
+        
+        try:
+            result = future.result()
+            if result['success']:
+                self.model = result['model']
+                self.analyzer = result['analyzer']
+                self.visualizer = result['visualizer']
+                self._set_impact_scores({})
+                self.focused_node = None
+                self.focus_label.config(text="No focus element selected", fg=self.colors['text_light'])
+                self.model_status.config(text=f"Loaded: {self.model.name}")
+                self._refresh_node_cache()
                 
-                success = self.model.load_archimate_xml(Path(file_path))
-                if success:
-                    self.model_status.config(text=f"Loaded: {self.model.name}")
-                    
-                    # Initialize analyzer and visualizer
-                    self.analyzer = ArchimateAnalyzer(self.model)
-                    self.visualizer = GraphVisualizer(self.model)
-                    
-                    # Update displays
-                    self.update_model_display()
-                    self.update_tree_display()
-                    self.update_importance_options()  # Initialize importance options
-                    self.update_visualization()
-                    
-                    messagebox.showinfo("Success", 
-                                      f"Model loaded successfully!\n\n"
-                                      f"Elements: {self.model.get_node_count()}\n"
-                                      f"Relationships: {self.model.get_edge_count()}\n\n"
-                                      f"Use the Analysis tab to explore the architecture.")
-                else:
-                    messagebox.showerror("Error", "Failed to load model!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Error loading model: {str(e)}")
+                # Update displays
+                self.update_model_display()
+                self.update_tree_display()
+                self.update_importance_options()  # Initialize importance options
+                self.update_visualization()
+                self.load_progress['value'] = 100
+                
+                messagebox.showinfo("Success", 
+                                  f"Model loaded successfully!\n\n"
+                                  f"Elements: {self.model.get_node_count()}\n"
+                                  f"Relationships: {self.model.get_edge_count()}\n\n"
+                                  f"Use the Analysis tab to explore the architecture.")
+            else:
+                self.model_status.config(text="No model loaded")
+                self.load_progress['value'] = 0
+                messagebox.showerror("Error", "Failed to load model!")
+        except Exception as e:
+            self.model_status.config(text="No model loaded")
+            self.load_progress['value'] = 0
+            messagebox.showerror("Error", f"Error loading model: {str(e)}")
     
     def update_model_display(self):
         """Update model statistics and metrics"""
@@ -1025,10 +1396,12 @@ class EnhancedDigitalTwinDashboard:
         self.total_elements_var.set(str(self.model.get_node_count()))
         self.total_relations_var.set(str(self.model.get_edge_count()))
         
-        # Calculate average centrality
-        centralities = [data.get('centrality', 0) for data in self.model.graph.nodes.values()]
-        avg_centrality = sum(centralities) / len(centralities) if centralities else 0
-        self.avg_centrality_var.set(f"{avg_centrality:.3f}")
+        # Calculate average centrality - cached until the next model load
+        if self._avg_centrality_cache is None:
+            centralities = np.fromiter((data.get('centrality', 0.0) for data in self.model.graph.nodes.values()),
+                                       dtype=np.float64, count=self.model.get_node_count())
+            self._avg_centrality_cache = float(centralities.mean()) if centralities.size else 0.0
+        self.avg_centrality_var.set(f"{self._avg_centrality_cache:.3f}")
         
         # Calculate complexity
         complexity_ratio = self.model.get_edge_count() / max(1, self.model.get_node_count())
@@ -1056,30 +1429,32 @@ class EnhancedDigitalTwinDashboard:
         if width <= 1 or height <= 1:
             return
         
-        # Count elements by layer
-        layer_counts = defaultdict(int)
-        for data in self.model.graph.nodes.values():
-            layer = data.get('layer', 'Other')
-            layer_counts[layer] += 1
+        # Count elements by layer - cached until the next model load
+        if self._layer_counts_cache is None:
+            self._layer_counts_cache = Counter(data.get('layer', 'Other')
+                                               for data in self.model.graph.nodes.values())
+        layer_counts = self._layer_counts_cache
         
         layers = ["Motivation", "Strategy", "Business", "Application", "Technology", "Implementation", "Other"]
+        
+        # Precompute bar geometry so the loop only issues canvas calls
         max_count = max(layer_counts.values()) if layer_counts else 1
+        counts = np.array([layer_counts.get(layer, 0) for layer in layers])
+        bar_width = width / (len(layers) + 1)
+        bar_heights = counts / max_count * (height - 100)
+        x1s = np.arange(len(layers)) * bar_width + 50
+        x2s = x1s + 0.8 * bar_width
+        y1s = height - 50 - bar_heights
+        label_xs = x1s + bar_width/2
         
         # Draw bar chart
-        bar_width = width / (len(layers) + 1)
-        for i, layer in enumerate(layers):
-            count = layer_counts.get(layer, 0)
-            bar_height = (count / max_count) * (height - 100)
-            x1 = i * bar_width + 50
-            y1 = height - 50 - bar_height
-            x2 = (i + 0.8) * bar_width + 50
-            y2 = height - 50
-            
+        for layer, count, x1, y1, x2, label_x in zip(layers, counts.tolist(), x1s.tolist(), y1s.tolist(),
+                                                    x2s.tolist(), label_xs.tolist()):
             color = self.colors.get(layer.lower(), self.colors['other'])
-            self.layer_canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline='white')
-            self.layer_canvas.create_text(x1 + bar_width/2, height - 30, text=layer, 
+            self.layer_canvas.create_rectangle(x1, y1, x2, height - 50, fill=color, outline='white')
+            self.layer_canvas.create_text(label_x, height - 30, text=layer, 
                                         font=('Arial', 8), angle=45, anchor=tk.NE)
-            self.layer_canvas.create_text(x1 + bar_width/2, y1 - 10, text=str(count),
+            self.layer_canvas.create_text(label_x, y1 - 10, text=str(count),
                                         font=('Arial', 9, 'bold'), fill=self.colors['text_dark'])
     
     # =========================================================================
@@ -1093,7 +1468,7 @@ class EnhancedDigitalTwinDashboard:
             return
         
         try:
-            self.impact_scores = self.model.get_impact_analysis(self.focused_node, max_depth=3)
+            self._set_impact_scores(self.model.get_impact_analysis(self.focused_node, max_depth=3))
             
             # Update visualization
             self.update_visualization()
@@ -1112,36 +1487,32 @@ class EnhancedDigitalTwinDashboard:
         if not self.impact_scores:
             return
         
+        nodes = self.model.graph.nodes
         filtered_scores = self.get_filtered_impact_scores()
         
         # Group by layer
-        layer_impacts = {}
+        layer_impacts = defaultdict(list)
         for node, score in filtered_scores.items():
-            if score > 0.01:  # Only significant impacts
-                layer = self.model.graph.nodes[node].get('layer', 'Other')
-                if layer not in layer_impacts:
-                    layer_impacts[layer] = []
-                layer_impacts[layer].append((node, score))
+            layer = nodes[node].get('layer', 'Other')
+            layer_impacts[layer].append((node, score))
         
-        results = "IMPACT ANALYSIS RESULTS\n"
-        results += "=" * 50 + "\n\n"
+        results = ["IMPACT ANALYSIS RESULTS\n", "=" * 50 + "\n\n"]
         
-        focus_name = self.model.graph.nodes[self.focused_node].get('name', self.focused_node)
-        results += f"Focus Element: {focus_name}\n"
-        results += f"Total Affected Elements: {len([s for s in filtered_scores.values() if s > 0.01])}\n"
-        results += f"Filtered from: {len([s for s in self.impact_scores.values() if s > 0.01])} total impacts\n\n"
+        focus_name = nodes[self.focused_node].get('name', self.focused_node)
+        results.append(f"Focus Element: {focus_name}\n")
+        results.append(f"Total Affected Elements: {len(filtered_scores)}\n")
+        results.append(f"Filtered from: {len(self._significant_impacts)} total impacts\n\n")
         
         for layer in ['Motivation', 'Strategy', 'Business', 'Application', 'Technology', 'Implementation']:
             if layer in layer_impacts:
-                results += f"{layer.upper()} LAYER:\n"
-                # Sort by impact score
-                layer_impacts[layer].sort(key=lambda x: x[1], reverse=True)
-                for node, score in layer_impacts[layer][:8]:  # Top 8 per layer
-                    node_name = self.model.graph.nodes[node].get('name', node)
-                    results += f"  {score:.3f} - {node_name}\n"
-                results += "\n"
-        
-        self.show_results(results)
+                results.append(f"{layer.upper()} LAYER:\n")
+                # Top 8 per layer by impact score
+                for node, score in heapq.nlargest(8, layer_impacts[layer], key=lambda x: x[1]):
+                    node_name = nodes[node].get('name', node)
+                    results.append(f"  {score:.3f} - {node_name}\n")
+                results.append("\n")
+        
+        self.show_results(''.join(results))
     
     def run_centrality_analysis(self):
         """Run centrality analysis"""
@@ -1150,26 +1521,33 @@ class EnhancedDigitalTwinDashboard:
             return
         
         try:
-            centrality_scores = self.analyzer.analyze_centrality()
+            # Reuse scores already computed for this model and mode
+            approximate = self.approx_centrality_var.get()
+            if approximate not in self._centrality_cache:
+                self._centrality_cache[approximate] = self.analyzer.analyze_centrality(approximate)
+            centrality_scores = self._centrality_cache[approximate]
             
             # Create visualization
-            self.fig.clf()
+            self._use_shared_figure()
             self.visualizer.plot_centrality_analysis(centrality_scores)
-            self.canvas.draw()
+            self.canvas.draw_idle()
+            
+            nodes = self.model.graph.nodes
             
             # Show results
-            results = "CENTRALITY ANALYSIS RESULTS\n"
-            results += "=" * 50 + "\n\n"
+            results = ["CENTRALITY ANALYSIS RESULTS",
+                       " (approximate)\n" if approximate else "\n",
+                       "=" * 50 + "\n\n"]
             
             for measure, scores in centrality_scores.items():
-                results += f"{measure.upper()} CENTRALITY:\n"
-                top_nodes = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:10]
+                results.append(f"{measure.upper()} CENTRALITY:\n")
+                top_nodes = heapq.nlargest(10, scores.items(), key=lambda x: x[1])
                 for node, score in top_nodes:
-                    node_name = self.model.graph.nodes[node].get('name', node)
-                    results += f"  {node_name}: {score:.4f}\n"
-                results += "\n"
+                    node_name = nodes[node].get('name', node)
+                    results.append(f"  {node_name}: {score:.4f}\n")
+                results.append("\n")
             
-            self.show_results(results)
+            self.show_results(''.join(results))
         except Exception as e:
             messagebox.showerror("Error", f"Centrality analysis failed: {str(e)}")
     
@@ -1183,27 +1561,27 @@ class EnhancedDigitalTwinDashboard:
             communities = self.analyzer.detect_communities()
             
             # Create visualization
-            self.fig.clf()
+            self._use_shared_figure()
             self.visualizer.plot_community_structure(communities)
-            self.canvas.draw()
+            self.canvas.draw_idle()
+            
+            nodes = self.model.graph.nodes
             
             # Show results
-            results = "COMMUNITY DETECTION RESULTS\n"
-            results += "=" * 50 + "\n\n"
+            results = ["COMMUNITY DETECTION RESULTS\n", "=" * 50 + "\n\n"]
             
-            for comm_id, nodes in communities.items():
-                results += f"Community {comm_id + 1}: {len(nodes)} nodes\n"
+            for comm_id, members in communities.items():
+                results.append(f"Community {comm_id + 1}: {len(members)} nodes\n")
                 # Show top nodes in community
-                community_nodes = [(node, self.model.graph.nodes[node].get('importance_score', 0)) 
-                                 for node in nodes]
-                community_nodes.sort(key=lambda x: x[1], reverse=True)
+                community_nodes = ((node, nodes[node].get('importance_score', 0)) 
+                                   for node in members)
                 
-                for node, score in community_nodes[:5]:  # Top 5 nodes
-                    node_name = self.model.graph.nodes[node].get('name', node)
-                    results += f"  {node_name} (importance: {score:.3f})\n"
-                results += "\n"
+                for node, score in heapq.nlargest(5, community_nodes, key=lambda x: x[1]):  # Top 5 nodes
+                    node_name = nodes[node].get('name', node)
+                    results.append(f"  {node_name} (importance: {score:.3f})\n")
+                results.append("\n")
             
-            self.show_results(results)
+            self.show_results(''.join(results))
         except Exception as e:
             messagebox.showerror("Error", f"Community detection failed: {str(e)}")
     
@@ -1216,19 +1594,19 @@ class EnhancedDigitalTwinDashboard:
         try:
             bottlenecks = self.analyzer.find_bottlenecks()
             
-            results = "ARCHITECTURE BOTTLENECKS\n"
-            results += "=" * 50 + "\n\n"
+            nodes = self.model.graph.nodes
+            results = ["ARCHITECTURE BOTTLENECKS\n", "=" * 50 + "\n\n"]
             
             for i, (u, v) in enumerate(bottlenecks[:10], 1):
-                u_name = self.model.graph.nodes[u].get('name', u)
-                v_name = self.model.graph.nodes[v].get('name', v)
+                u_name = nodes[u].get('name', u)
+                v_name = nodes[v].get('name', v)
                 rel_data = self.model.graph[u][v]
                 rel_type = rel_data.get('relationship_type', 'Unknown')
                 
-                results += f"{i}. {u_name} → {v_name}\n"
-                results += f"   Type: {rel_type}, Weight: {rel_data.get('weight', 0.5):.2f}\n\n"
+                results.append(f"{i}. {u_name} → {v_name}\n")
+                results.append(f"   Type: {rel_type}, Weight: {rel_data.get('weight', 0.5):.2f}\n\n")
             
-            self.show_results(results)
+            self.show_results(''.join(results))
         except Exception as e:
             messagebox.showerror("Error", f"Bottleneck analysis failed: {str(e)}")
     
@@ -1245,10 +1623,10 @@ class EnhancedDigitalTwinDashboard:
             self.importance_var.set("medium")
             self.on_filter_change()
             
-            self.fig.clf()
+            self._use_shared_figure()
             impact_for_viz = self.impact_scores if self.impact_scores else None
             self.visualizer.plot_layered_layout(impact_for_viz, "Value Stream View")
-            self.canvas.draw()
+            self.canvas.draw_idle()
             
             self.show_results("Value Stream View activated.\nFocusing on Business layer with medium+ importance.")
         except Exception as e:
@@ -1263,26 +1641,23 @@ class EnhancedDigitalTwinDashboard:
         try:
             health = self.analyzer.get_architecture_health_metrics()
             
-            results = "ARCHITECTURE HEALTH METRICS\n"
-            results += "=" * 50 + "\n\n"
-            
-            for metric, value in health.items():
-                results += f"{metric.replace('_', ' ').title()}: {value:.3f}\n"
+            results = ["ARCHITECTURE HEALTH METRICS\n", "=" * 50 + "\n\n"]
+            results.extend(f"{metric.replace('_', ' ').title()}: {value:.3f}\n"
+                           for metric, value in health.items())
             
             # Add interpretation
-            results += "\nINTERPRETATION:\n"
-            results += "• Density: Lower is better for layered architectures\n"
-            results += "• Modularity: Higher indicates better separation\n" 
-            results += "• Clustering: Higher indicates more local connectivity\n"
+            results.append("\nINTERPRETATION:\n")
+            results.append("• Density: Lower is better for layered architectures\n")
+            results.append("• Modularity: Higher indicates better separation\n")
+            results.append("• Clustering: Higher indicates more local connectivity\n")
             
-            self.show_results(results)
+            self.show_results(''.join(results))
         except Exception as e:
             messagebox.showerror("Error", f"Health metrics failed: {str(e)}")
     
     def show_results(self, text):
         """Display results in the results text area"""
-        self.results_text.delete(1.0, tk.END)
-        self.results_text.insert(1.0, text)
+        self.results_text.replace(1.0, tk.END, text)
     
     # =========================================================================
     # EXPORT METHODS
@@ -1321,11 +1696,116 @@ class EnhancedDigitalTwinDashboard:
         
         if file_path:
             try:
-                impact_for_export = self.get_filtered_impact_scores() if self.impact_scores else None
-                self.visualizer.export_interactive_html(impact_for_export or {}, file_path)
-                messagebox.showinfo("Success", f"Interactive HTML exported to:\n{file_path}")
+                impact_for_export = self.get_filtered_impact_scores() if self.impact_scores else {}
+                if importlib.util.find_spec("pyvis") is not None:
+                    visualizer = self.visualizer
+                    job = lambda: visualizer.export_interactive_html(impact_for_export, file_path)
+                else:
+                    # No pyvis - export the current view as a snapshot with an element overlay.
+                    # The figure is rendered here on the Tk thread; only the write is backgrounded.
+                    page = self.build_snapshot_html(impact_for_export)
+                    job = lambda: self._write_snapshot_html(page, file_path)
             except Exception as e:
                 messagebox.showerror("Error", f"Export failed: {str(e)}")
+                return
+            
+            self.model_status.config(text="Exporting...")
+            self._poll_export(self._executor.submit(job), file_path)
+    
+    def _poll_export(self, future, file_path):
+        """Wait on the Tk thread for an export job run by the worker"""
+        if not future.done():
+            self.root.after(50, self._poll_export, future, file_path)
+            return
+        self._on_export_done(file_path, future.exception())
+    
+    def _on_export_done(self, file_path, error):
+        """Report export result on the Tk thread"""
+        self.model_status.config(text=f"Loaded: {self.model.name}")
+        if error is None:
+            messagebox.showinfo("Success", f"Interactive HTML exported to:\n{file_path}")
+        else:
+            messagebox.showerror("Error", f"Export failed: {str(error)}")
+    
+    def _export_key(self):
+        """Signature of what's on the embedded figure - the last render, the view limits and
+        the number of full draws (other analysis views, pan/zoom, resizes all redraw it)"""
+        limits = tuple((ax.get_xlim(), ax.get_ylim()) for ax in self.fig.axes)
+        return (self._last_render_key, limits, self._figure_generation)
+    
+    def build_snapshot_html(self, impact_scores):
+        """Render the current view as a PNG background plus a JSON element overlay"""
+        # Repeated exports of an unchanged view reuse the PNG
+        key = self._export_key()
+        if key != self._last_export_key or self._last_export_png is None:
+            buf = io.BytesIO()
+            self.fig.savefig(buf, format='png', dpi=150)
+            self._last_export_png = base64.b64encode(buf.getvalue()).decode('ascii')
+            self._last_export_key = key
+        png = self._last_export_png
+        
+        overlay = [
+            {
+                'id': node_id,
+                'name': data.get('name', node_id),
+                'type': data.get('type', 'Unknown'),
+                'layer': data.get('layer', 'Other'),
+                'importance': round(float(data.get('importance_score', 0)), 3),
+                'impact': round(float(impact_scores.get(node_id, 0)), 3)
+            }
+            for node_id, data in self.get_filtered_elements()
+        ]
+        overlay_json = json.dumps(overlay).replace("</", "<\\/")
+        
+        page = f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{escape(self.model.name)} - {self.viz_type.get()} view</title>
+<style>
+body {{ font-family: Arial, sans-serif; margin: 0; display: flex; }}
+#view {{ flex: 3; }} #view img {{ width: 100%; }}
+#panel {{ flex: 1; padding: 10px; overflow-y: auto; height: 100vh; box-sizing: border-box; }}
+#panel li {{ cursor: default; padding: 2px 0; }}
+</style>
+</head>
+<body>
+<div id="view"><img src="data:image/png;base64,{png}"></div>
+<div id="panel">
+<input id="filter" placeholder="Search elements..." style="width: 100%">
+<ul id="elements"></ul>
+</div>
+<script type="application/json" id="overlay">{overlay_json}</script>
+<script>
+var elements = JSON.parse(document.getElementById('overlay').textContent);
+function render(query) {{
+  var list = document.getElementById('elements');
+  list.innerHTML = '';
+  elements.filter(function (e) {{
+    return !query || (e.name + ' ' + e.type).toLowerCase().indexOf(query) >= 0;
+  }}).forEach(function (e) {{
+    var li = document.createElement('li');
+    li.textContent = e.name;
+    li.title = 'Type: ' + e.type + '\\nLayer: ' + e.layer +
+               '\\nImportance: ' + e.importance + '\\nImpact: ' + e.impact;
+    list.appendChild(li);
+  }});
+}}
+document.getElementById('filter').addEventListener('input', function () {{
+  render(this.value.toLowerCase());
+}});
+render('');
+</script>
+</body>
+</html>
+"""
+        return page
+    
+    def _write_snapshot_html(self, page, file_path):
+        """Write a snapshot page built by build_snapshot_html"""
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(page)
+        print(f"✅ Snapshot HTML exported to: {file_path}")
 
 def main():
     """Main application entry point"""
@@ -2,20 +2,253 @@
 GRAPHML-CORE ENGINE - Archimate Digital Twin
 Uses GraphML as the fundamental data model for powerful graph analysis
 """
-import xml.etree.ElementTree as ET
+try:
+    import lxml.etree as ET
+    _HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _HAVE_LXML = False
 import networkx as nx
+_NX_MAJOR = int(nx.__version__.split('.')[0])
+import numpy as np
+try:
+    import scipy.sparse as sp
+except ImportError:
+    sp = None
 from typing import Dict, List, Any, Optional, Set, Tuple
 from pathlib import Path
 from dataclasses import dataclass, field
 from collections import defaultdict, deque
+from functools import lru_cache
 import json
 import time
+import hashlib
+import pickle
+import importlib.util
+import sys
+
+try:
+    from modeller_config import DEFAULT_METRICS_LOWER, ARCHIMATE_ELEMENT_TYPES
+except ImportError:
+    DEFAULT_METRICS_LOWER = {}
+    ARCHIMATE_ELEMENT_TYPES = ()
+
+_EMPTY_METRICS = {}  # Shared default for types without metrics; always copied
+
+XSI_TYPE = '{http://www.w3.org/2001/XMLSchema-instance}type'
+
+# Centrality results are cached per source file. Betweenness runs Brandes
+# from at most this many sampled sources, O(k*E) instead of O(V*E): scores
+# are approximate on larger models (exact at or below the cap), but the
+# node ranking they feed into importance_score is preserved.
+METRICS_CACHE_DIR = Path.home() / '.archimate_cache'
+BETWEENNESS_SAMPLE_SIZE = 128
+
+# Below this size GPU launch overhead outweighs the nx-cugraph speedup
+GPU_MIN_NODES = 5000
+
+
+@lru_cache(maxsize=None)
+def _have_cugraph() -> bool:
+    """True when the nx-cugraph backend is installed"""
+    return importlib.util.find_spec('nx_cugraph') is not None
+
+
+def _iterparse_xml(file_path: Path):
+    """Stream (event, element) pairs with lxml when available, ElementTree otherwise"""
+    if _HAVE_LXML:
+        return ET.iterparse(str(file_path), events=('start', 'end'),
+                            huge_tree=True, remove_blank_text=True)
+    return ET.iterparse(str(file_path), events=('start', 'end'))
+
+
+def _release(elem):
+    """Free a processed element and any siblings already handled"""
+    elem.clear()
+    if _HAVE_LXML:
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+# Keyword tables for the type classifiers (first matching entry wins)
+LAYER_KEYWORDS = {
+    'Motivation': ["stakeholder", "driver", "goal", "requirement", "assessment", "value"],
+    'Strategy': ["capability", "resource", "course", "outcome"],
+    'Business': ["business", "process", "service", "function", "event", "contract", "product", "actor", "role"],
+    'Application': ["application", "component", "function", "service", "interface", "data"],
+    'Technology': ["technology", "device", "system", "software", "network", "node"],
+    'Implementation': ["workpackage", "deliverable", "plateau", "gap", "implementation"]
+}
+
+AI_CATEGORY_KEYWORDS = {
+    'motivation': ['stakeholder', 'driver', 'goal', 'requirement'],
+    'capability': ['capability', 'resource', 'course'],
+    'process': ['process', 'function', 'service'],
+    'data': ['data', 'object', 'information'],
+    'technology': ['technology', 'device', 'system', 'software'],
+    'organization': ['actor', 'role', 'interface'],
+    'project': ['workpackage', 'deliverable', 'plateau']
+}
+
+SEMANTIC_TYPES = {
+    'composition': 'structural',
+    'aggregation': 'structural',
+    'realization': 'functional',
+    'influence': 'behavioral',
+    'triggering': 'temporal',
+    'flow': 'data_flow',
+    'access': 'permission',
+    'serving': 'functional',
+    'assignment': 'organizational',
+    'association': 'general'
+}
+
+RELATIONSHIP_WEIGHTS = {
+    'composition': 1.0,
+    'aggregation': 0.9,
+    'realization': 0.8,
+    'influence': 0.7,
+    'triggering': 0.6,
+    'flow': 0.5,
+    'access': 0.4,
+    'association': 0.3
+}
+
+AI_IMPORTANCE = {
+    'realization': 0.9,
+    'composition': 0.8,
+    'influence': 0.7,
+    'triggering': 0.6,
+    'flow': 0.5,
+    'access': 0.4
+}
+
+LAYER_WEIGHTS = {
+    'Motivation': 0.9,
+    'Strategy': 0.8,
+    'Business': 0.7,
+    'Application': 0.6,
+    'Technology': 0.5,
+    'Implementation': 0.4,
+    'Other': 0.3
+}
+
+
+# Archimate types come from a small fixed vocabulary, so each classifier
+# only does its substring scan once per distinct type.
+@lru_cache(maxsize=256)
+def _classify_layer(element_type: str) -> str:
+    element_type_lower = element_type.lower()
+    for layer, keywords in LAYER_KEYWORDS.items():
+        if any(keyword in element_type_lower for keyword in keywords):
+            return layer
+    return "Other"
+
+
+@lru_cache(maxsize=256)
+def _classify_ai_category(element_type: str) -> str:
+    element_type_lower = element_type.lower()
+    for category, keywords in AI_CATEGORY_KEYWORDS.items():
+        if any(keyword in element_type_lower for keyword in keywords):
+            return category
+    return 'other'
+
+
+@lru_cache(maxsize=256)
+def _classify_semantic_type(relationship_type: str) -> str:
+    rel_type_lower = relationship_type.lower()
+    for rel_key, semantic_type in SEMANTIC_TYPES.items():
+        if rel_key in rel_type_lower:
+            return semantic_type
+    return 'general'
+
+
+@lru_cache(maxsize=256)
+def _classify_relationship_weight(relationship_type: str) -> float:
+    rel_type_lower = relationship_type.lower()
+    for rel_key, weight in RELATIONSHIP_WEIGHTS.items():
+        if rel_key in rel_type_lower:
+            return weight
+    return 0.5
+
+
+@lru_cache(maxsize=256)
+def _classify_ai_importance(relationship_type: str) -> float:
+    rel_type_lower = relationship_type.lower()
+    for rel_key, importance in AI_IMPORTANCE.items():
+        if rel_key in rel_type_lower:
+            return importance
+    return 0.3
+
+
+# Direct type -> layer table for the known Archimate vocabulary; the keyword
+# scan is only needed for types outside it
+TYPE_TO_LAYER = {element_type: _classify_layer(element_type) for element_type in ARCHIMATE_ELEMENT_TYPES}
+
+
+@dataclass(slots=True)
+class _NodeRec:
+    """Parsed element, held compactly until it is added to the graph"""
+    name: str
+    type: str
+    layer: str
+    metrics: Dict[str, float]
+    documentation: str
+    properties: Dict[str, str]
+    ai_category: str
+    
+    def attrs(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'type': self.type,
+            'layer': self.layer,
+            'metrics': self.metrics,
+            'documentation': self.documentation,
+            'properties': self.properties,
+            'ai_category': self.ai_category,
+            'importance_score': 0.0,  # Will be computed later
+            'centrality': 0.0,  # Will be computed later
+        }
+
+
+@dataclass(slots=True)
+class _EdgeRec:
+    """Parsed relationship, held compactly until it is added to the graph"""
+    source: str
+    target: str
+    relationship_type: str
+    relationship_id: str
+    name: str
+    documentation: str
+    semantic_type: str
+    weight: float
+    ai_importance: float
+    
+    def attrs(self) -> Dict[str, Any]:
+        return {
+            'relationship_type': self.relationship_type,
+            'relationship_id': self.relationship_id,
+            'name': self.name,
+            'documentation': self.documentation,
+            'semantic_type': self.semantic_type,
+            'weight': self.weight,
+            'ai_importance': self.ai_importance
+        }
+
 
 class GraphMLArchimateModel:
     def __init__(self, name: str = "Unnamed Model"):
         self.name = name
         self.graph = nx.DiGraph()  # Directed graph for Archimate relationships
         self.source_file: Optional[Path] = None
+        self._impact_cache = None  # (graph size key, csr adjacency, node ids, index)
+        
+        # Per-node metric columns, aligned with node_ids (filled by _compute_graph_metrics)
+        self.node_ids: List[str] = []
+        self.centrality = np.zeros(0)
+        self.pagerank = np.zeros(0)
+        self.importance = np.zeros(0)
+        self.layer_weight = np.zeros(0)
+        self.doc_score = np.zeros(0)
         
     def load_archimate_xml(self, file_path: Path) -> bool:
         """Load Archimate XML and convert directly to NetworkX graph"""
@@ -24,27 +257,25 @@ class GraphMLArchimateModel:
                 return False
             
             print(f"📖 Loading Archimate model from: {file_path}")
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            
             self.graph.clear()
-            self.name = root.get('name', 'Unnamed Model')
             self.source_file = file_path
+            self._impact_cache = None
             
-            # Parse elements and add as nodes
-            elements = self._parse_elements(root)
-            for element_id, element_data in elements.items():
-                self.graph.add_node(element_id, **element_data)
+            # Single streaming pass over the file for elements and relationships
+            model_name, elements, relationships = self._parse_archimate(file_path)
+            self.name = model_name or 'Unnamed Model'
             
-            # Parse relationships and add as edges
-            relationships = self._parse_relationships(root, elements)
-            for rel_id, rel_data in relationships.items():
-                if rel_data['source'] in elements and rel_data['target'] in elements:
-                    self.graph.add_edge(
-                        rel_data['source'], 
-                        rel_data['target'], 
-                        **rel_data['attributes']
-                    )
+            edges = (
+                (rec.source, rec.target, rec.attrs())
+                for rec in relationships.values()
+                if rec.source in elements and rec.target in elements
+            )
+            if _NX_MAJOR >= 3 and type(self.graph) is nx.DiGraph:
+                self._bulk_load(elements, edges)
+            else:
+                # Add elements as nodes, relationships as edges
+                self.graph.add_nodes_from((element_id, rec.attrs()) for element_id, rec in elements.items())
+                self.graph.add_edges_from(edges)
             
             # Calculate graph metrics
             self._compute_graph_metrics()
@@ -58,217 +289,128 @@ class GraphMLArchimateModel:
             traceback.print_exc()
             return False
     
-    def _parse_elements(self, root: ET.Element) -> Dict[str, Dict]:
-        """Parse Archimate elements into graph nodes with rich attributes"""
-        elements = {}
+    def _bulk_load(self, elements: Dict[str, '_NodeRec'], edges):
+        """Fill the freshly cleared DiGraph's internal dicts directly.
         
-        for folder in root.findall('.//folder'):
-            for element in folder.findall('.//element'):
-                element_id = element.get('id')
-                element_name = element.get('name', 'Unnamed')
-                
-                if not element_id:
-                    continue
-                
-                # Extract element type
-                element_type = element.get('{http://www.w3.org/2001/XMLSchema-instance}type', '')
-                if not element_type:
-                    element_type = element.get('type', '')
-                
-                if ':' in element_type:
-                    clean_type = element_type.split(':', 1)[1]
-                else:
-                    clean_type = element_type
-                
-                if 'Relationship' in clean_type:
-                    continue  # Skip relationship elements (handled separately)
-                
-                layer = self._determine_layer(clean_type)
-                
-                # Get default metrics
-                try:
-                    from modeller_config import DEFAULT_METRICS
-                    metrics = DEFAULT_METRICS.get(clean_type, {}).copy()
-                except ImportError:
-                    metrics = {}
-                
-                # Create node with rich attributes
-                elements[element_id] = {
-                    'name': element_name,
-                    'type': clean_type,
-                    'layer': layer,
-                    'metrics': metrics,
-                    'documentation': self._extract_documentation(element),
-                    'properties': self._extract_properties(element),
-                    'ai_category': self._determine_ai_category(clean_type, layer),
-                    'importance_score': 0.0,  # Will be computed later
-                    'centrality': 0.0,  # Will be computed later
-                }
+        Equivalent to add_nodes_from/add_edges_from, minus the per-item
+        validation and factory calls. Every edge endpoint is a parsed
+        element, so each node's adjacency dicts already exist.
+        """
+        graph = self.graph
+        node, succ, pred = graph._node, graph._succ, graph._pred
+        for element_id, rec in elements.items():
+            node[element_id] = rec.attrs()
+            succ[element_id] = {}
+            pred[element_id] = {}
         
-        return elements
+        for u, v, attrs in edges:
+            datadict = succ[u].get(v)
+            if datadict is None:
+                succ[u][v] = pred[v][u] = attrs
+            else:
+                datadict.update(attrs)  # Parallel relationship: last one wins, as in add_edge
+        clear_cache = getattr(nx, '_clear_cache', None)  # NetworkX >= 3.3 caches derived views
+        if clear_cache is not None:
+            clear_cache(graph)
     
-    def _parse_relationships(self, root: ET.Element, elements: Dict) -> Dict[str, Dict]:
-        """Parse relationships into graph edges with semantic attributes"""
+    def _parse_archimate(self, file_path: Path) -> Tuple[Optional[str], Dict[str, '_NodeRec'], Dict[str, '_EdgeRec']]:
+        """Stream the XML once, collecting elements and relationships as they close"""
+        model_name = None
+        elements = {}
         relationships = {}
         
-        # Parse relationship elements
-        for folder in root.findall('.//folder'):
-            for element in folder.findall('.//element'):
-                element_id = element.get('id')
-                element_type = element.get('{http://www.w3.org/2001/XMLSchema-instance}type', '')
-                
-                if not element_type or 'Relationship' not in element_type:
-                    continue
-                
-                if ':' in element_type:
-                    clean_type = element_type.split(':', 1)[1]
-                else:
-                    clean_type = element_type
-                
-                source_id = element.get('source')
-                target_id = element.get('target')
-                
-                if all([element_id, source_id, target_id]):
-                    relationships[element_id] = {
-                        'source': source_id,
-                        'target': target_id,
-                        'attributes': {
-                            'relationship_type': clean_type,
-                            'relationship_id': element_id,
-                            'name': element.get('name', ''),
-                            'documentation': self._extract_documentation(element),
-                            'semantic_type': self._determine_semantic_type(clean_type),
-                            'weight': self._calculate_relationship_weight(clean_type),
-                            'ai_importance': self._calculate_ai_importance(clean_type)
-                        }
-                    }
-        
-        # Also parse direct relationship elements
-        for rel in root.findall('.//relationship'):
-            rel_id = rel.get('id')
-            source_id = rel.get('source')
-            target_id = rel.get('target')
-            rel_type = rel.get('{http://www.w3.org/2001/XMLSchema-instance}type', '')
+        for event, elem in _iterparse_xml(file_path):
+            if event == 'start':
+                if model_name is None:
+                    model_name = elem.get('name', 'Unnamed Model')
+                continue
             
-            if all([rel_id, source_id, target_id, rel_type]):
-                if ':' in rel_type:
-                    clean_type = rel_type.split(':', 1)[1]
-                else:
-                    clean_type = rel_type
-                
-                relationships[rel_id] = {
-                    'source': source_id,
-                    'target': target_id,
-                    'attributes': {
-                        'relationship_type': clean_type,
-                        'relationship_id': rel_id,
-                        'name': rel.get('name', ''),
-                        'documentation': self._extract_documentation(rel),
-                        'semantic_type': self._determine_semantic_type(clean_type),
-                        'weight': self._calculate_relationship_weight(clean_type),
-                        'ai_importance': self._calculate_ai_importance(clean_type)
-                    }
-                }
+            tag = elem.tag
+            if tag != 'element' and tag != 'relationship':
+                continue
+            
+            element_id = elem.get('id')
+            xsi_type = elem.get(XSI_TYPE, '')
+            if tag == 'relationship' or 'Relationship' in xsi_type:
+                # Relationships appear both as folder elements and as direct <relationship> tags
+                if xsi_type:
+                    rel_rec = self._parse_relationship(elem, element_id, xsi_type)
+                    if rel_rec:
+                        relationships[element_id] = rel_rec
+            elif element_id:
+                node_rec = self._parse_element(elem, xsi_type or elem.get('type', ''))
+                if node_rec:
+                    elements[element_id] = node_rec
+            _release(elem)
         
-        return relationships
+        return model_name, elements, relationships
     
-    def _determine_layer(self, element_type: str) -> str:
-        """Determine architecture layer for element type"""
-        element_type_lower = element_type.lower()
+    def _parse_element(self, element, element_type: str) -> Optional['_NodeRec']:
+        """Build the node attributes for one Archimate element"""
+        element_name = element.get('name', 'Unnamed')
         
-        layer_mapping = {
-            'Motivation': ["stakeholder", "driver", "goal", "requirement", "assessment", "value"],
-            'Strategy': ["capability", "resource", "course", "outcome"],
-            'Business': ["business", "process", "service", "function", "event", "contract", "product", "actor", "role"],
-            'Application': ["application", "component", "function", "service", "interface", "data"],
-            'Technology': ["technology", "device", "system", "software", "network", "node"],
-            'Implementation': ["workpackage", "deliverable", "plateau", "gap", "implementation"]
-        }
+        clean_type = sys.intern(element_type.partition(':')[2] or element_type)
+        
+        if 'Relationship' in clean_type:
+            return None  # Skip relationship elements (handled separately)
         
-        for layer, keywords in layer_mapping.items():
-            if any(keyword in element_type_lower for keyword in keywords):
-                return layer
+        layer = self._determine_layer(clean_type)
         
-        return "Other"
+        # Get default metrics
+        metrics = DEFAULT_METRICS_LOWER.get(clean_type.lower(), _EMPTY_METRICS).copy()
+        
+        # Create node with rich attributes
+        return _NodeRec(
+            name=element_name,
+            type=clean_type,
+            layer=layer,
+            metrics=metrics,
+            documentation=self._extract_documentation(element),
+            properties=self._extract_properties(element),
+            ai_category=self._determine_ai_category(clean_type, layer),
+        )
     
-    def _determine_ai_category(self, element_type: str, layer: str) -> str:
-        """Categorize elements for AI understanding"""
-        category_mapping = {
-            'motivation': ['stakeholder', 'driver', 'goal', 'requirement'],
-            'capability': ['capability', 'resource', 'course'],
-            'process': ['process', 'function', 'service'],
-            'data': ['data', 'object', 'information'],
-            'technology': ['technology', 'device', 'system', 'software'],
-            'organization': ['actor', 'role', 'interface'],
-            'project': ['workpackage', 'deliverable', 'plateau']
-        }
+    def _parse_relationship(self, element, element_id: Optional[str], element_type: str) -> Optional['_EdgeRec']:
+        """Build the edge record for a relationship element"""
+        clean_type = sys.intern(element_type.partition(':')[2] or element_type)
+        
+        source_id = element.get('source')
+        target_id = element.get('target')
         
-        element_type_lower = element_type.lower()
-        for category, keywords in category_mapping.items():
-            if any(keyword in element_type_lower for keyword in keywords):
-                return category
+        if not (element_id and source_id and target_id):
+            return None
         
-        return 'other'
+        return _EdgeRec(
+            source=source_id,
+            target=target_id,
+            relationship_type=clean_type,
+            relationship_id=element_id,
+            name=element.get('name', ''),
+            documentation=self._extract_documentation(element),
+            semantic_type=self._determine_semantic_type(clean_type),
+            weight=self._calculate_relationship_weight(clean_type),
+            ai_importance=self._calculate_ai_importance(clean_type)
+        )
+    
+    def _determine_layer(self, element_type: str) -> str:
+        """Determine architecture layer for element type"""
+        return TYPE_TO_LAYER.get(element_type) or _classify_layer(element_type)
+    
+    def _determine_ai_category(self, element_type: str, layer: str) -> str:
+        """Categorize elements for AI understanding"""
+        return _classify_ai_category(element_type)
     
     def _determine_semantic_type(self, relationship_type: str) -> str:
         """Determine semantic relationship type for AI understanding"""
-        semantic_mapping = {
-            'composition': 'structural',
-            'aggregation': 'structural',
-            'realization': 'functional',
-            'influence': 'behavioral',
-            'triggering': 'temporal',
-            'flow': 'data_flow',
-            'access': 'permission',
-            'serving': 'functional',
-            'assignment': 'organizational',
-            'association': 'general'
-        }
-        
-        rel_type_lower = relationship_type.lower()
-        for rel_key, semantic_type in semantic_mapping.items():
-            if rel_key in rel_type_lower:
-                return semantic_type
-        
-        return 'general'
+        return _classify_semantic_type(relationship_type)
     
     def _calculate_relationship_weight(self, relationship_type: str) -> float:
         """Calculate relationship weight for AI analysis"""
-        weight_mapping = {
-            'composition': 1.0,
-            'aggregation': 0.9,
-            'realization': 0.8,
-            'influence': 0.7,
-            'triggering': 0.6,
-            'flow': 0.5,
-            'access': 0.4,
-            'association': 0.3
-        }
-        
-        rel_type_lower = relationship_type.lower()
-        for rel_key, weight in weight_mapping.items():
-            if rel_key in rel_type_lower:
-                return weight
-        
-        return 0.5
+        return _classify_relationship_weight(relationship_type)
     
     def _calculate_ai_importance(self, relationship_type: str) -> float:
         """Calculate AI importance for relationship filtering"""
-        importance_mapping = {
-            'realization': 0.9,
-            'composition': 0.8,
-            'influence': 0.7,
-            'triggering': 0.6,
-            'flow': 0.5,
-            'access': 0.4
-        }
-        
-        rel_type_lower = relationship_type.lower()
-        for rel_key, importance in importance_mapping.items():
-            if rel_key in rel_type_lower:
-                return importance
-        
-        return 0.3
+        return _classify_ai_importance(relationship_type)
     
     def _extract_documentation(self, element: ET.Element) -> str:
         """Extract documentation from element"""
@@ -295,81 +437,168 @@ class GraphMLArchimateModel:
         if not self.graph.nodes():
             return
         
+        self._build_node_columns()
+        
         # Method 1: Try advanced centrality calculations
         try:
-            betweenness = nx.betweenness_centrality(self.graph, weight='weight')
-            pagerank = nx.pagerank(self.graph, weight='weight')
+            sample_size = min(BETWEENNESS_SAMPLE_SIZE, self.graph.number_of_nodes())
+            cache_path = self._metrics_cache_path(sample_size)
+            cached = self._load_cached_metrics(cache_path)
+            if cached is not None:
+                betweenness, pagerank = cached
+            else:
+                betweenness, pagerank = self._run_centrality(sample_size)
+                self._store_cached_metrics(cache_path, betweenness, pagerank)
+            
+            node_ids = self.node_ids
+            self.centrality = np.fromiter((betweenness.get(n, 0.0) for n in node_ids),
+                                          dtype=np.float64, count=len(node_ids))
+            self.pagerank = np.fromiter((pagerank.get(n, 0.0) for n in node_ids),
+                                        dtype=np.float64, count=len(node_ids))
+            
+            # Calculate importance using advanced metrics
+            self.importance = self.centrality * 0.5 + self.layer_weight * 0.3 + self.doc_score * 0.2
+            self._write_node_metrics()
             
-            for node_id in self.graph.nodes():
-                centrality_score = betweenness.get(node_id, 0.0)
-                pagerank_score = pagerank.get(node_id, 0.0)
-                
-                self.graph.nodes[node_id]['centrality'] = centrality_score
-                self.graph.nodes[node_id]['pagerank'] = pagerank_score
-                
-                # Calculate importance using advanced metrics
-                layer_weight = self._get_layer_weight(self.graph.nodes[node_id]['layer'])
-                documentation_score = min(1.0, len(self.graph.nodes[node_id].get('documentation', '')) / 100.0)
-                
-                importance_score = (
-                    centrality_score * 0.5 +
-                    layer_weight * 0.3 +
-                    documentation_score * 0.2
-                )
-                self.graph.nodes[node_id]['importance_score'] = importance_score
-                
         except Exception as e:
             print(f"⚠️ Could not compute advanced graph metrics: {e}")
             # Method 2: Fallback to simple degree-based calculation
             self._compute_fallback_metrics()
 
+    def _build_node_columns(self):
+        """Index nodes and gather the per-node inputs to the importance score as arrays"""
+        nodes = self.graph.nodes
+        self.node_ids = list(self.graph)
+        count = len(self.node_ids)
+        self.layer_weight = np.fromiter(
+            (LAYER_WEIGHTS.get(nodes[n].get('layer', 'Other'), 0.5) for n in self.node_ids),
+            dtype=np.float64, count=count)
+        self.doc_score = np.minimum(1.0, np.fromiter(
+            (len(nodes[n].get('documentation', '')) for n in self.node_ids),
+            dtype=np.float64, count=count) / 100.0)
+    
+    def _write_node_metrics(self):
+        """Copy the metric columns back onto the graph's node attributes"""
+        nodes = self.graph.nodes
+        for node_id, centrality, pagerank, importance in zip(
+                self.node_ids, self.centrality.tolist(), self.pagerank.tolist(), self.importance.tolist()):
+            data = nodes[node_id]
+            data['centrality'] = centrality
+            data['pagerank'] = pagerank
+            data['importance_score'] = importance
+    
+    def _run_centrality(self, sample_size: int) -> Tuple[Dict, Dict]:
+        """Run betweenness and PageRank, on the GPU for large models when nx-cugraph is installed"""
+        if self.graph.number_of_nodes() >= GPU_MIN_NODES and _have_cugraph():
+            try:
+                betweenness = nx.betweenness_centrality(self.graph, k=sample_size, weight='weight',
+                                                        seed=42, normalized=True, backend='cugraph')
+                pagerank = nx.pagerank(self.graph, weight='weight', backend='cugraph')
+                return dict(betweenness), dict(pagerank)
+            except Exception as e:
+                print(f"⚠️ cugraph backend failed, using NetworkX: {e}")
+        
+        # Run on an integer-labelled copy: int hashing/compares are much cheaper
+        # than the string ids inside Brandes' inner loop
+        node_ids = list(self.graph)
+        index = {node_id: i for i, node_id in enumerate(node_ids)}
+        int_graph = nx.DiGraph()
+        int_graph.add_nodes_from(range(len(node_ids)))
+        int_graph.add_edges_from(
+            (index[u], index[v], {'weight': w})
+            for u, v, w in self.graph.edges(data='weight', default=1)
+        )
+        
+        betweenness = nx.betweenness_centrality(int_graph, k=sample_size, weight='weight',
+                                                seed=42, normalized=True)
+        pagerank = nx.pagerank(int_graph, weight='weight')
+        return ({node_ids[i]: score for i, score in betweenness.items()},
+                {node_ids[i]: score for i, score in pagerank.items()})
+    
+    def _metrics_cache_path(self, sample_size: int) -> Optional[Path]:
+        """Cache file for this model's centrality results, or None if unsaved"""
+        if self.source_file is None:
+            return None
+        try:
+            mtime = self.source_file.stat().st_mtime
+        except OSError:
+            return None
+        key = (f"{self.source_file.resolve()}:{mtime}:{self.graph.number_of_nodes()}:"
+               f"{self.graph.number_of_edges()}:{sample_size}")
+        return METRICS_CACHE_DIR / f"{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}.pkl"
+    
+    def _load_cached_metrics(self, cache_path: Optional[Path]):
+        """Return cached (betweenness, pagerank) for this model if present"""
+        if cache_path is None or not cache_path.exists():
+            return None
+        try:
+            with open(cache_path, 'rb') as f:
+                betweenness, pagerank = pickle.load(f)
+            print(f"♻️ Reusing cached graph metrics from: {cache_path}")
+            return betweenness, pagerank
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable metrics cache: {e}")
+            return None
+    
+    def _store_cached_metrics(self, cache_path: Optional[Path], betweenness: Dict, pagerank: Dict):
+        """Persist centrality results so reloading an unchanged model skips them"""
+        if cache_path is None:
+            return
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump((betweenness, pagerank), f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            print(f"⚠️ Could not write metrics cache: {e}")
+    
     def _compute_fallback_metrics(self):
         """Compute fallback metrics when advanced calculations fail"""
-        for node_id in self.graph.nodes():
-            node_data = self.graph.nodes[node_id]
-            
-            # Simple degree-based centrality
-            in_degree = self.graph.in_degree(node_id)
-            out_degree = self.graph.out_degree(node_id)
-            total_degree = in_degree + out_degree
-            degree_centrality = total_degree / max(1, (self.graph.number_of_nodes() - 1))
-            
-            self.graph.nodes[node_id]['centrality'] = degree_centrality
-            self.graph.nodes[node_id]['pagerank'] = degree_centrality
-            
-            # Calculate importance using fallback method
-            layer_weight = self._get_layer_weight(node_data.get('layer', 'Other'))
-            documentation_score = min(1.0, len(node_data.get('documentation', '')) / 100.0)
-            
-            importance_score = (
-                degree_centrality * 0.4 +
-                layer_weight * 0.4 +
-                documentation_score * 0.2
-            )
-            self.graph.nodes[node_id]['importance_score'] = importance_score
+        count = len(self.node_ids)
+        
+        # Simple degree-based centrality
+        in_degree = np.fromiter((d for _, d in self.graph.in_degree(self.node_ids)), dtype=np.int32, count=count)
+        out_degree = np.fromiter((d for _, d in self.graph.out_degree(self.node_ids)), dtype=np.int32, count=count)
+        degree_centrality = (in_degree + out_degree).astype(np.float64) / max(1, count - 1)
+        
+        self.centrality = degree_centrality
+        self.pagerank = degree_centrality.copy()
+        
+        # Calculate importance using fallback method
+        self.importance = degree_centrality * 0.4 + self.layer_weight * 0.4 + self.doc_score * 0.2
+        self._write_node_metrics()
+    
     def _get_layer_weight(self, layer: str) -> float:
         """Get weight for layer importance"""
-        layer_weights = {
-            'Motivation': 0.9,
-            'Strategy': 0.8,
-            'Business': 0.7,
-            'Application': 0.6,
-            'Technology': 0.5,
-            'Implementation': 0.4,
-            'Other': 0.3
-        }
-        return layer_weights.get(layer, 0.5)
+        return LAYER_WEIGHTS.get(layer, 0.5)
     
     def export_to_graphml(self, file_path: Path) -> bool:
         """Export the graph to GraphML format"""
         try:
-            nx.write_graphml(self.graph, file_path)
+            graph = self._graphml_safe_graph()
+            if _HAVE_LXML:
+                # Streams through lxml instead of building the whole XML tree first
+                nx.write_graphml_lxml(graph, str(file_path), named_key_ids=True, infer_numeric_types=False)
+            else:
+                nx.write_graphml(graph, file_path, named_key_ids=True)
             print(f"✅ GraphML exported to: {file_path}")
             return True
         except Exception as e:
             print(f"❌ Error exporting GraphML: {e}")
             return False
     
+    def _graphml_safe_graph(self) -> nx.DiGraph:
+        """Copy of the graph with dict/list attributes JSON-encoded, as GraphML only holds scalars"""
+        graph = self.graph.copy()
+        for _, data in graph.nodes(data=True):
+            for key, value in data.items():
+                if isinstance(value, (dict, list, tuple)):
+                    data[key] = json.dumps(value)
+        for _, _, data in graph.edges(data=True):
+            for key, value in data.items():
+                if isinstance(value, (dict, list, tuple)):
+                    data[key] = json.dumps(value)
+        return graph
+    
     def get_node_count(self) -> int:
         return len(self.graph.nodes())
     
@@ -385,10 +614,52 @@ class GraphMLArchimateModel:
     
     def get_impact_analysis(self, start_node: str, max_depth: int = 3) -> Dict[str, float]:
         """Perform impact analysis using graph algorithms"""
-        impact_scores = {}
-        
         if start_node not in self.graph:
-            return impact_scores
+            return {}
+        if sp is None:
+            return self._impact_bfs(start_node, max_depth)
+        
+        adjacency, node_ids, index = self._impact_adjacency()
+        visited = np.zeros(len(node_ids), dtype=bool)
+        start = index[start_node]
+        visited[start] = True
+        impact_scores = {start_node: 1.0}
+        
+        # Level-synchronous BFS: each hop scales the frontier rows by their
+        # impact and keeps the strongest incoming path per newly reached node
+        frontier = np.array([start])
+        values = np.array([1.0])
+        for _ in range(max_depth):
+            reach = (sp.diags(values) @ adjacency[frontier]).max(axis=0).toarray().ravel()
+            reach[visited] = 0.0
+            reached = np.flatnonzero(reach > 0.01)  # Only track significant impacts
+            if not reached.size:
+                break
+            visited[reached] = True
+            frontier = reached
+            values = reach[reached]
+            impact_scores.update(zip((node_ids[i] for i in reached), values.tolist()))
+        
+        return impact_scores
+    
+    def _impact_adjacency(self):
+        """CSR matrix of decayed edge weights (weight * 0.8), rebuilt when the graph changes"""
+        key = (self.graph.number_of_nodes(), self.graph.number_of_edges())
+        if self._impact_cache is None or self._impact_cache[0] != key:
+            node_ids = list(self.graph)
+            index = {node_id: i for i, node_id in enumerate(node_ids)}
+            rows, cols, weights = [], [], []
+            for u, v, w in self.graph.edges(data='weight', default=0.5):
+                rows.append(index[u])
+                cols.append(index[v])
+                weights.append(w * 0.8)  # Decay factor
+            adjacency = sp.csr_matrix((weights, (rows, cols)), shape=(len(node_ids), len(node_ids)))
+            self._impact_cache = (key, adjacency, node_ids, index)
+        return self._impact_cache[1:]
+    
+    def _impact_bfs(self, start_node: str, max_depth: int) -> Dict[str, float]:
+        """Pure-Python impact BFS used when SciPy is unavailable"""
+        impact_scores = {}
         
         # Use BFS with relationship weights
         visited = set()
@@ -8,25 +8,27 @@ The system models each ArchiMate element as a computational neuron
 with YAML-defined behavior that processes and propagates metric signals
 through the enterprise architecture graph.
 """
+from types import MappingProxyType
+
 MODELS_DIR="./"
 # =============================================================================
 # SIMULATION ENGINE CONFIGURATION
 # =============================================================================
 
-SIMULATION = {
+SIMULATION = MappingProxyType({
     "time_step_ms": 100,           # Simulation clock granularity
     "max_propagation_depth": 50,   # Prevent infinite propagation loops
     "signal_decay_factor": 0.8,    # How signals weaken over hops
     "default_activation_threshold": 0.1,  # Minimum signal strength to propagate
     "enable_parallel_processing": True,
     "max_workers": 4,              # For parallel neuron processing
-}
+})
 
 # =============================================================================
 # NEURAL NODE TYPE DEFINITIONS
 # =============================================================================
 
-NEURON_TYPES = {
+NEURON_TYPES = MappingProxyType({
     "motivation": {
         "Stakeholder": {
             "input_metrics": ["sentiment", "influence", "satisfaction"],
@@ -92,13 +94,13 @@ NEURON_TYPES = {
             "propagation_delay_ms": 180,
         }
     }
-}
+})
 
 # =============================================================================
 # PROPAGATION RULES BY RELATIONSHIP TYPE
 # =============================================================================
 
-PROPAGATION_RULES = {
+PROPAGATION_RULES = MappingProxyType({
     "influences": {
         "signal_transform": "amplify",
         "weight": 0.8,
@@ -126,26 +128,26 @@ PROPAGATION_RULES = {
         "allowed_layers": ["business->business", "application->application"],
         "metric_mapping": {"completion_signal": "activation_signal"}
     }
-}
+})
 
 # =============================================================================
 # METRIC DEFINITIONS AND RANGES
 # =============================================================================
 
-METRICS = {
+METRICS = MappingProxyType({
     "performance": {"min": 0, "max": 1, "default": 0.7, "decay_rate": 0.1},
     "cost": {"min": 0, "max": 1000000, "default": 1000, "decay_rate": 0.05},
     "availability": {"min": 0, "max": 1, "default": 0.99, "decay_rate": 0.02},
     "sentiment": {"min": -1, "max": 1, "default": 0.5, "decay_rate": 0.15},
     "throughput": {"min": 0, "max": 10000, "default": 100, "decay_rate": 0.08},
     "workload": {"min": 0, "max": 1, "default": 0.3, "decay_rate": 0.12},
-}
+})
 
 # =============================================================================
 # WORKLOAD SIMULATOR PROFILES
 # =============================================================================
 
-WORKLOAD_PROFILES = {
+WORKLOAD_PROFILES = MappingProxyType({
     "customer_channel_shift": {
         "description": "Simulates migration from physical to digital channels",
         "target_neurons": ["BusinessProcess", "BusinessService"],
@@ -172,13 +174,13 @@ WORKLOAD_PROFILES = {
             "urgency": {"from": 0.3, "to": 0.9, "duration_ms": 2000}
         }
     }
-}
+})
 
 # =============================================================================
 # MONITORING AND OUTPUT CONFIGURATION
 # =============================================================================
 
-MONITORING = {
+MONITORING = MappingProxyType({
     "output_neurons": [
         "BusinessService:customer_satisfaction",
         "Goal:achievement_level", 
@@ -195,13 +197,13 @@ MONITORING = {
         "sentiment": {"warning": 0.3, "critical": 0.0},
         "cost": {"warning": 50000, "critical": 100000}
     }
-}
+})
 
 # =============================================================================
 # DEFAULT METRICS FOR ELEMENT TYPES
 # =============================================================================
 
-DEFAULT_METRICS = {
+DEFAULT_METRICS = MappingProxyType({
     "Stakeholder": {"satisfaction": 0.7, "influence": 0.8},
     "Driver": {"urgency": 0.9, "impact": 0.8},
     "Goal": {"achievement": 0.0, "priority": 0.9},
@@ -221,4 +223,36 @@ DEFAULT_METRICS = {
     "WorkPackage": {"progress": 0.0, "budget_utilization": 0.3},
     "Deliverable": {"completeness": 0.0, "quality": 0.8},
     "Plateau": {"maturity": 0.5, "stability": 0.7}
-}
+})
+
+# Case-insensitive view of DEFAULT_METRICS for type lookups
+DEFAULT_METRICS_LOWER = MappingProxyType({k.lower(): v for k, v in DEFAULT_METRICS.items()})
+
+# =============================================================================
+# ARCHIMATE ELEMENT VOCABULARY
+# =============================================================================
+
+ARCHIMATE_ELEMENT_TYPES = (
+    # Motivation
+    "Stakeholder", "Driver", "Assessment", "Goal", "Outcome", "Principle",
+    "Requirement", "Constraint", "Meaning", "Value",
+    # Strategy
+    "Resource", "Capability", "ValueStream", "CourseOfAction",
+    # Business
+    "BusinessActor", "BusinessRole", "BusinessCollaboration", "BusinessInterface",
+    "BusinessProcess", "BusinessFunction", "BusinessInteraction", "BusinessEvent",
+    "BusinessService", "BusinessObject", "Contract", "Representation", "Product",
+    # Application
+    "ApplicationComponent", "ApplicationCollaboration", "ApplicationInterface",
+    "ApplicationFunction", "ApplicationInteraction", "ApplicationProcess",
+    "ApplicationEvent", "ApplicationService", "DataObject",
+    # Technology & Physical
+    "Node", "Device", "SystemSoftware", "TechnologyCollaboration", "TechnologyInterface",
+    "Path", "CommunicationNetwork", "TechnologyFunction", "TechnologyProcess",
+    "TechnologyInteraction", "TechnologyEvent", "TechnologyService", "Artifact",
+    "Equipment", "Facility", "DistributionNetwork", "Material",
+    # Implementation & Migration
+    "WorkPackage", "Deliverable", "ImplementationEvent", "Plateau", "Gap",
+    # Other
+    "Location", "Grouping", "Junction",
+)
@@ -9,8 +9,13 @@
 
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
-import json, os, math, re
+import tkinter.font as tkfont
+import json, os, math, re, pickle, hashlib
 from datetime import datetime
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 
 # Try to import the user's config (DEFAULT_ORGANISATION, ARCHITECTURE_DOMAINS, HEADER_PROMPT, APPROVED_SOURCES, VALIDATION_RULES)
 try:
@@ -36,6 +41,31 @@ try:
 except Exception:
     TIKTOKEN_AVAILABLE = False
 
+# Optional fast JSON encoder (orjson) for the serialisations done per estimate and on export.
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except Exception:
+    ORJSON_AVAILABLE = False
+
+def dumps_compact(obj) -> str:
+    """Minimal JSON (no whitespace) - the form fed to the token estimator."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj).decode("utf-8")
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits - let the stdlib handle it
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+def dumps_pretty(obj) -> str:
+    """Two-space indented JSON for previews and exported files."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
 # ---------- Configuration: model & thresholds ----------
 # Targeting Copilot / GPT-4 Turbo-ish environment
 MODEL_NAME_FOR_ESTIMATE = "gpt-4o"  # symbolic. tiktoken will map common models.
@@ -44,28 +74,159 @@ SAFE_GREEN = 20000      # comfortable
 SAFE_AMBER = 32000      # approaching Copilot limit
 SAFE_RED = 64000        # definitely too large (use 1M for enterprise models if available)
 
+DOMAIN_ROW_HEIGHT = 26  # px per row in the domain list; rows are only built while on screen
+
+# Compiled once; these run for every prompt, estimate and summarised object
+_WS_RE = re.compile(r"\s+")
+_SENT_RE = re.compile(r"(.+?[.!?])\s")
+
 # ---------- Token estimator helper ----------
+@lru_cache(maxsize=4)
+def _get_encoder(model_name: str):
+    """
+    tiktoken encoder for the model, built once per process (construction is far slower than encoding).
+    Returns None when no encoding can be loaded, e.g. the BPE files cannot be downloaded.
+    """
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except Exception:
+        # Model name not found: choose a default encoding
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            return None
+
 def estimate_tokens(text: str, model_name: str = MODEL_NAME_FOR_ESTIMATE) -> int:
     """
     Estimate tokens for given text. Uses tiktoken if available; fallback to chars/4 heuristic.
     """
     if not text:
         return 0
-    if TIKTOKEN_AVAILABLE:
-        try:
-            enc = tiktoken.encoding_for_model(model_name)
-        except Exception:
-            # Model name not found: choose a default encoding
-            enc = tiktoken.get_encoding("cl100k_base")
-        toks = len(enc.encode(text))
-        return toks
-    else:
-        # Heuristic: average 4 characters per token (approx)
-        # Also compress long repeated whitespace and typical XML/JSON punctuation cost
-        cleaned = re.sub(r"\s+", " ", text)
-        return max(1, int(len(cleaned) / 4))
+    enc = _get_encoder(model_name) if TIKTOKEN_AVAILABLE else None
+    if enc is not None:
+        return len(enc.encode(text))
+    return estimate_tokens_heuristic(text)
+
+def estimate_tokens_heuristic(text: str) -> int:
+    """Average 4 characters per token, with whitespace runs counted as a single space."""
+    n = len(text)
+    # Short text, or text already compacted to single spaces: the regex can't change the answer
+    # (much), so skip it - this runs on every edit of the prompt when tiktoken isn't available
+    if n < 64 or not ("  " in text or "\n" in text or "\t" in text or "\r" in text):
+        return max(1, n >> 2)
+    return max(1, len(_WS_RE.sub(" ", text)) >> 2)
+
+# tiktoken's batch encoder releases the GIL, so it can use several cores at once
+ENCODE_THREADS = max(1, (os.cpu_count() or 2) // 2)
+# Very large batches scale badly in one call; bigger inputs go through in chunks of this size
+ENCODE_CHUNK = 256
+
+def _encode_batch(enc, texts: list) -> list:
+    """Encode texts in ENCODE_CHUNK-sized encode_batch calls."""
+    if len(texts) <= ENCODE_CHUNK:
+        return _encode_chunk(enc, texts)
+    out = []
+    for i in range(0, len(texts), ENCODE_CHUNK):
+        out.extend(_encode_chunk(enc, texts[i:i + ENCODE_CHUNK]))
+    return out
+
+def _encode_chunk(enc, texts: list) -> list:
+    """encode_batch across ENCODE_THREADS; shards over a thread pool for encoders without num_threads."""
+    try:
+        return enc.encode_batch(texts, num_threads=ENCODE_THREADS)
+    except TypeError:
+        pass
+    if ENCODE_THREADS == 1 or len(texts) < 2 * ENCODE_THREADS:
+        return enc.encode_batch(texts)
+    step = math.ceil(len(texts) / ENCODE_THREADS)
+    shards = [texts[i:i + step] for i in range(0, len(texts), step)]
+    with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+        return [toks for part in pool.map(enc.encode_batch, shards) for toks in part]
+
+def estimate_tokens_batch(texts: list, model_name: str = MODEL_NAME_FOR_ESTIMATE) -> list:
+    """
+    Token estimates for several texts at once. With tiktoken, texts already in the token-count
+    cache are not encoded again and the rest go through batched encode_batch calls.
+    """
+    enc = _get_encoder(model_name) if TIKTOKEN_AVAILABLE else None
+    if enc is None:
+        return [estimate_tokens(t, model_name) for t in texts]
+    cache = _token_counts
+    keys = [_token_count_key(model_name, t) for t in texts]
+    counts = [None] * len(texts)
+    missing = []
+    for i, k in enumerate(keys):
+        c = cache.get(k)
+        if c is None:
+            missing.append(i)
+        else:
+            counts[i] = c
+            cache.move_to_end(k)
+    if missing:
+        for i, toks in zip(missing, _encode_batch(enc, [texts[i] for i in missing])):
+            counts[i] = cache[keys[i]] = len(toks)
+        while len(cache) > TOKEN_CACHE_MAX:
+            cache.popitem(last=False)
+    return counts
+
+# ---------- Token-count cache (kept between sessions) ----------
+TOKEN_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".archimate_tokcache.pkl")
+TOKEN_CACHE_MAX = 10000  # entries, least recently used dropped first
+
+_token_counts = OrderedDict()  # blake2b(model, text) digest -> token count
+
+def _token_count_key(model_name: str, text: str) -> bytes:
+    return hashlib.blake2b(f"{model_name}\0{text}".encode("utf-8"), digest_size=16).digest()
+
+def load_token_cache(path: str = TOKEN_CACHE_PATH):
+    """Restore token counts saved by a previous session. A missing or unreadable file is ignored."""
+    try:
+        with open(path, "rb") as f:
+            saved = pickle.load(f)
+        if isinstance(saved, dict):
+            _token_counts.update(saved)
+    except Exception:
+        pass
+
+def save_token_cache(path: str = TOKEN_CACHE_PATH):
+    """Write the token counts out for the next session (best effort)."""
+    if not _token_counts:
+        return
+    try:
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(_token_counts, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
+@lru_cache(maxsize=256)
+def _key_tokens(key: str) -> int:
+    """Tokens for a JSON key - the same handful of keys repeat on every cached object."""
+    return estimate_tokens(key)
 
 # ---------- Small helpers ----------
+def apply_amendments(objs: list) -> list:
+    """
+    Replay description amendments onto the objects they amend.
+    Amendment entries are dropped from the result; the cached list itself is left untouched.
+    """
+    latest = {}
+    for o in objs:
+        if o.get("amends"):
+            latest[(o.get("element_type"), o.get("name"))] = o.get("description", "")
+    if not latest:
+        return objs
+    resolved = []
+    for o in objs:
+        if o.get("amends"):
+            continue
+        key = (o.get("element_type"), o.get("name"))
+        if key in latest:
+            o = dict(o, description=latest[key])
+        resolved.append(o)
+    return resolved
+
 def short_summary(text: str, max_chars: int = 200) -> str:
     """
     Produce a cheap local 'summary' of a text block for token-saving.
@@ -73,16 +234,39 @@ def short_summary(text: str, max_chars: int = 200) -> str:
     """
     if not text:
         return ""
-    # Try to grab first sentence (up to punctuation)
-    m = re.search(r"(.+?[.!?])\s", text)
+    # Try to grab first sentence (up to punctuation) - in the head of long descriptions
+    # first, since that's where it almost always is
+    head = text[:max_chars + 200]
+    m = _SENT_RE.search(head)
+    if m is None and len(text) > len(head):
+        # e.g. a heading line without punctuation ahead of the first sentence
+        m = _SENT_RE.search(text)
     if m:
         s = m.group(1).strip()
         if len(s) <= max_chars:
             return s
-    s = text.strip().replace("\n", " ")
+    s = text.strip()
     if len(s) > max_chars:
-        s = s[:max_chars].rsplit(" ", 1)[0] + "..."
-    return s
+        s = s[:max_chars].replace("\n", " ").rsplit(" ", 1)[0] + "..."
+    return s.replace("\n", " ")
+
+@lru_cache(maxsize=None)
+def _split_template(template: str):
+    """
+    Pieces of a prompt template around its {organisation} fields, or None when the template
+    uses any other format syntax and has to go through str.format.
+    """
+    parts = template.split("{organisation}")
+    if any("{" in p or "}" in p for p in parts):
+        return None
+    return tuple(parts)
+
+def fill_template(template: str, org: str) -> str:
+    """template.format(organisation=org), without re-parsing the template every time."""
+    parts = _split_template(template)
+    if parts is None:
+        return template.format(organisation=org)
+    return org.join(parts)
 
 def compact_text_for_prompt(text: str) -> str:
     """
@@ -90,7 +274,7 @@ def compact_text_for_prompt(text: str) -> str:
     """
     if not text:
         return ""
-    return re.sub(r"\s+", " ", text).strip()
+    return _WS_RE.sub(" ", text).strip()
 
 # ---------- Main app ----------
 class TokenAwarePromptGenerator:
@@ -102,15 +286,28 @@ class TokenAwarePromptGenerator:
         # State
         self.selected_domains = set()
         self.prompts = []                    # list of generated prompt texts (string)
+        self._prompt_token_counts = []       # token count per generated prompt, filled at generation
+        self._header_tokens = None           # HEADER_PROMPT token count, computed on first estimate
+        self._shared_prefix = ""             # static text every generated prompt starts from
         self.prompt_json_cache = {}          # domain_id -> generated JSON objects (list)
+        self._domain_token_cache = {}        # domain_id -> (object count, token count)
+        self._json_indexes = {}              # domain_id -> (element index, relationship set) for merging
+        self._summary_columns = {}           # domain_id -> per-object summary columns, see _summary_columns_for
+        self._sources_rows = {}              # approved source key -> (tree iid, row values shown)
         self.current_prompt_index = 0
         self.org_name = DEFAULT_ORGANISATION
+        self._estimate_job = None            # pending Tk after() id for a debounced estimate
+        self._status_flush_pending = False   # update_status has an idle refresh queued
 
         # UI
         self.create_widgets()
         self.bind_shortcuts()
 
     # ---------- UI ----------
+    def bind_shortcuts(self):
+        # Re-estimate as the prompt is edited, once typing settles
+        self.current_prompt_text.bind("<<Modified>>", self._on_prompt_modified)
+
     def create_widgets(self):
         notebook = ttk.Notebook(self.root)
         notebook.grid(row=0, column=0, sticky="nsew", padx=8, pady=8)
@@ -168,24 +365,25 @@ class TokenAwarePromptGenerator:
         domain_frame = ttk.LabelFrame(parent, text="Architecture Domains", padding=8)
         domain_frame.pack(fill="both", expand=True, padx=4, pady=4)
 
-        # scrollable domain list
+        # scrollable domain list - virtualised: the vars exist for every domain, but the
+        # checkbutton/label rows are only created while they're scrolled into view
         canvas = tk.Canvas(domain_frame, height=360)
         scrollbar = ttk.Scrollbar(domain_frame, orient="vertical", command=canvas.yview)
-        scrollable = ttk.Frame(canvas)
-        scrollable.bind("<Configure>", lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
-        canvas.create_window((0,0), window=scrollable, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        self.domain_vars = {}
-        row = 0
-        for domain_id, domain_info in ARCHITECTURE_DOMAINS.items():
-            var = tk.BooleanVar(value=False)
-            self.domain_vars[domain_id] = var
-            cb = ttk.Checkbutton(scrollable, text=domain_info.get("name", domain_id), variable=var, command=self.update_domain_selection)
-            cb.grid(row=row, column=0, sticky="w", padx=(2,2), pady=2)
-            desc = ttk.Label(scrollable, text=domain_info.get("description",""), font=("Arial", 8), foreground="gray")
-            desc.grid(row=row, column=1, sticky="w", padx=(8,0), pady=2)
-            row += 1
+
+        def on_yscroll(first, last):
+            scrollbar.set(first, last)
+            self._render_domain_rows()
+        canvas.configure(yscrollcommand=on_yscroll)
+
+        self.domain_canvas = canvas
+        self._domain_items = list(ARCHITECTURE_DOMAINS.items())
+        self._domain_rows = {}  # row index -> (canvas item ids, widgets) currently on screen
+        self.domain_vars = {domain_id: tk.BooleanVar(value=False) for domain_id, _ in self._domain_items}
+        # Descriptions line up in one column past the longest name, as the old grid did
+        font = tkfont.nametofont("TkDefaultFont")
+        self._domain_desc_x = 40 + max((font.measure(info.get("name", domain_id))
+                                         for domain_id, info in self._domain_items), default=0)
+        canvas.configure(scrollregion=(0, 0, 0, len(self._domain_items) * DOMAIN_ROW_HEIGHT))
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
@@ -227,6 +425,7 @@ class TokenAwarePromptGenerator:
         btn_row.pack(fill="x", pady=(0,4))
         ttk.Button(btn_row, text="Estimate Tokens", command=self.estimate_current_prompt_tokens).pack(side="left", padx=3)
         ttk.Button(btn_row, text="Copy Prompt", command=self.copy_current_prompt).pack(side="left", padx=3)
+        ttk.Button(btn_row, text="Copy Shared Prefix Once", command=self.copy_shared_prefix).pack(side="left", padx=3)
         ttk.Button(btn_row, text="Save Prompt JSON (simulate AI output)", command=self.save_current_prompt_json).pack(side="left", padx=3)
         ttk.Button(btn_row, text="Next →", command=self.next_prompt).pack(side="right", padx=3)
         ttk.Button(btn_row, text="← Previous", command=self.previous_prompt).pack(side="right", padx=3)
@@ -270,6 +469,28 @@ class TokenAwarePromptGenerator:
         ttk.Label(cfg_frame, text="Using tiktoken: " + ("Yes" if TIKTOKEN_AVAILABLE else "No (heuristic)")).pack(side="left", padx=8)
 
     # ---------- Domain selection helpers ----------
+    def _render_domain_rows(self):
+        """Create the domain rows inside the visible part of the canvas and drop the rest."""
+        canvas = self.domain_canvas
+        n = len(self._domain_items)
+        top, bottom = canvas.yview()
+        first, last = int(top * n), min(n, int(bottom * n) + 1)
+        for i in [i for i in self._domain_rows if not first <= i < last]:
+            items, widgets = self._domain_rows.pop(i)
+            canvas.delete(*items)
+            for w in widgets:
+                w.destroy()
+        for i in range(first, last):
+            if i in self._domain_rows:
+                continue
+            domain_id, domain_info = self._domain_items[i]
+            y = i * DOMAIN_ROW_HEIGHT + DOMAIN_ROW_HEIGHT // 2
+            cb = ttk.Checkbutton(canvas, text=domain_info.get("name", domain_id), variable=self.domain_vars[domain_id], command=self.update_domain_selection)
+            desc = ttk.Label(canvas, text=domain_info.get("description",""), font=("Arial", 8), foreground="gray")
+            items = (canvas.create_window((2, y), window=cb, anchor="w"),
+                     canvas.create_window((self._domain_desc_x, y), window=desc, anchor="w"))
+            self._domain_rows[i] = (items, (cb, desc))
+
     def update_domain_selection(self):
         self.selected_domains.clear()
         for k,v in self.domain_vars.items():
@@ -300,7 +521,7 @@ class TokenAwarePromptGenerator:
             domain_info = ARCHITECTURE_DOMAINS.get(domain_id, {})
             templates = domain_info.get("prompt_templates", [])
             for t in templates:
-                prompt_text = t.format(organisation=org)
+                prompt_text = fill_template(t, org)
                 # make compact
                 prompt_text = compact_text_for_prompt(prompt_text)
                 if include_sources:
@@ -309,6 +530,11 @@ class TokenAwarePromptGenerator:
                 self.prompts.append(prompt_text)
                 self.prompt_meta.append((domain_id, prompt_text))
 
+        # Prompts don't change once generated, so count them all now in one batch
+        self._prompt_token_counts = estimate_tokens_batch(self.prompts)
+        # The header is identical for every prompt - keep it as one prefix to send first,
+        # so tools with prefix caching only process it once per session
+        self._shared_prefix = (HEADER_PROMPT or "").strip()
         self.current_prompt_index = 0
         self.update_prompt_display()
         self.update_status(f"Generated {len(self.prompts)} prompts across {len(self.selected_domains)} domains. Estimate tokens before use.")
@@ -319,13 +545,18 @@ class TokenAwarePromptGenerator:
             self.current_prompt_text.insert(1.0, self.prompts[self.current_prompt_index])
         self.refresh_all_prompts_view()
         self.estimate_current_prompt_tokens()
+        # Already estimated - don't let the programmatic edit schedule another one
+        self.current_prompt_text.edit_modified(False)
 
     def refresh_all_prompts_view(self):
         self.all_prompts_text.delete(1.0, tk.END)
+        parts = []
         for i,p in enumerate(self.prompts):
             flag = "▶ " if i == self.current_prompt_index else "   "
             preview = p if len(p) < 120 else p[:116] + "..."
-            self.all_prompts_text.insert(tk.END, f"{flag}Prompt {i+1}: {preview}\n")
+            parts.append(f"{flag}Prompt {i+1}: {preview}\n")
+        # One Tk insert for the whole list rather than one per prompt
+        self.all_prompts_text.insert(tk.END, "".join(parts))
 
     def previous_prompt(self):
         if self.current_prompt_index > 0:
@@ -338,12 +569,33 @@ class TokenAwarePromptGenerator:
             self.update_prompt_display()
 
     # ---------- Token estimation ----------
+    def _on_prompt_modified(self, event=None):
+        if self.current_prompt_text.edit_modified():
+            self._schedule_estimate()
+
+    def _schedule_estimate(self, delay_ms: int = 150):
+        if self._estimate_job:
+            self.root.after_cancel(self._estimate_job)
+        self._estimate_job = self.root.after(delay_ms, self._run_scheduled_estimate)
+
+    def _run_scheduled_estimate(self):
+        self._estimate_job = None
+        # Re-arm <<Modified>> so the next edit schedules a fresh estimate
+        self.current_prompt_text.edit_modified(False)
+        self.estimate_current_prompt_tokens()
+
     def estimate_current_prompt_tokens(self):
         text = self.current_prompt_text.get("1.0", tk.END).strip()
         # include header if you'd typically send it; but show both counts
-        header = HEADER_PROMPT or ""
-        header_tokens = estimate_tokens(header)
-        prompt_tokens = estimate_tokens(text)
+        if self._header_tokens is None:
+            self._header_tokens = estimate_tokens(HEADER_PROMPT or "")
+        header_tokens = self._header_tokens
+        idx = self.current_prompt_index
+        if idx < len(self._prompt_token_counts) and text == self.prompts[idx]:
+            prompt_tokens = self._prompt_token_counts[idx]
+        else:
+            # Edited (or no generated prompt) - count the text as it stands
+            prompt_tokens = estimate_tokens(text)
         total_if_sent = header_tokens + prompt_tokens
         self.current_tokens_var.set(f"{prompt_tokens} (hdr {header_tokens})")
         # Update totals from cache
@@ -355,11 +607,29 @@ class TokenAwarePromptGenerator:
 
     def calculate_cached_tokens(self):
         """Estimate tokens for all cached JSON outputs + header if you would re-send them."""
-        total = 0
-        for domain_id, json_objects in self.prompt_json_cache.items():
-            s = json.dumps(json_objects, ensure_ascii=False)
-            total += estimate_tokens(s)
-        return total
+        # Only domains changed since the last estimate are encoded again
+        token_cache = self._domain_token_cache
+        stale = [(domain_id, json_objects) for domain_id, json_objects in self.prompt_json_cache.items()
+                 if token_cache.get(domain_id, (None,))[0] != len(json_objects)]
+        if stale:
+            # Encode the values directly instead of a serialised copy of each domain; keys
+            # and JSON punctuation are added as a per-field overhead
+            texts, spans, overheads = [], [], []
+            for _, json_objects in stale:
+                start = len(texts)
+                overhead = 2  # [ ]
+                # Count what would be re-sent: amended descriptions, not the amendment entries
+                for o in apply_amendments(json_objects):
+                    overhead += 2  # { }
+                    for k, v in o.items():
+                        overhead += _key_tokens(k) + 3  # quotes, colon, comma
+                        texts.append(v if isinstance(v, str) else dumps_compact(v))
+                spans.append((start, len(texts)))
+                overheads.append(overhead)
+            counts = estimate_tokens_batch(texts)
+            for (domain_id, json_objects), (a, b), overhead in zip(stale, spans, overheads):
+                token_cache[domain_id] = (len(json_objects), sum(counts[a:b]) + overhead)
+        return sum(token_cache[domain_id][1] for domain_id in self.prompt_json_cache)
 
     def update_safety_indicator(self, tokens_total: int):
         self.safety_canvas.delete("all")
@@ -384,6 +654,19 @@ class TokenAwarePromptGenerator:
         except Exception:
             self.update_status("Copy failed — please copy manually.")
 
+    def copy_shared_prefix(self):
+        """Copy the header shared by all generated prompts; send it once, then each prompt body."""
+        if not self._shared_prefix:
+            messagebox.showinfo("No shared prefix", "Generate prompts first (and provide a HEADER_PROMPT).")
+            return
+        try:
+            self.root.clipboard_clear()
+            self.root.clipboard_append(self._shared_prefix)
+            self.root.update()
+            self.update_status(f"Shared prefix copied — send it once, then paste the {len(self.prompts)} prompts after it.")
+        except Exception:
+            self.update_status("Copy failed — please copy manually.")
+
     def save_current_prompt_json(self):
         """
         This function simulates the step where you have received the JSON array from the AI.
@@ -432,11 +715,8 @@ class TokenAwarePromptGenerator:
                 if not isinstance(parsed, list):
                     messagebox.showerror("Invalid JSON", "Top-level JSON must be an array of elements/relationships.")
                     return
-                # Save into cache (append if domain exists)
-                existing = self.prompt_json_cache.get(domain_id, [])
-                # Simple dedupe by element_type+name (merge)
-                merged = self._merge_json_lists(existing, parsed)
-                self.prompt_json_cache[domain_id] = merged
+                # Save into cache (append if domain exists), deduping by element_type+name (merge)
+                self._merge_json_lists(domain_id, parsed)
                 paste_window.destroy()
                 self.update_status(f"Saved {len(parsed)} objects to cache for domain {domain_id}")
                 self.refresh_cache_view()
@@ -449,23 +729,31 @@ class TokenAwarePromptGenerator:
         ttk.Button(btns, text="Generate Mock", command=use_mock).pack(side="left")
         ttk.Button(btns, text="Save Pasted JSON", command=save_pasted).pack(side="right")
 
-    def _merge_json_lists(self, existing: list, incoming: list) -> list:
+    def _merge_json_lists(self, domain_id: str, incoming: list) -> list:
         """
-        Merge incoming JSON list into existing while attempting to avoid duplicates.
+        Merge incoming JSON list into the domain's cached list while attempting to avoid duplicates.
         Deduplicate on (element_type, name) for elements, on relationship signature for relationships.
+        The dedupe index is kept per domain, so each save only scans the incoming objects.
+        A longer description for a known element is appended as an amendment entry rather than
+        rewriting the cached object, so earlier cache content stays byte-for-byte the same.
         """
-        out = list(existing)  # shallow copy
-        # Build index
-        elem_index = {}
-        rel_index = set()
-        for e in out:
-            if "element_type" in e and e.get("name"):
-                key = (e["element_type"], e["name"])
-                elem_index[key] = e
-            else:
-                # relationship
-                s = (e.get("element_type"), e.get("source_name"), e.get("target_name"), e.get("description"))
-                rel_index.add(s)
+        out = self.prompt_json_cache.setdefault(domain_id, [])
+        index = self._json_indexes.get(domain_id)
+        if index is None:
+            # Build index
+            elem_index = {}
+            rel_index = set()
+            for e in out:
+                if "element_type" in e and e.get("name"):
+                    key = (e["element_type"], e["name"])
+                    # later amendments carry the current description
+                    elem_index[key] = e
+                else:
+                    # relationship
+                    s = (e.get("element_type"), e.get("source_name"), e.get("target_name"), e.get("description"))
+                    rel_index.add(s)
+            index = self._json_indexes[domain_id] = (elem_index, rel_index)
+        elem_index, rel_index = index
         for item in incoming:
             if "element_type" in item and item.get("name"):
                 key = (item["element_type"], item["name"])
@@ -473,7 +761,10 @@ class TokenAwarePromptGenerator:
                     # merge descriptions conservatively
                     exist = elem_index[key]
                     if len(item.get("description","")) > len(exist.get("description","")):
-                        exist["description"] = item["description"]
+                        amendment = {"element_type": item["element_type"], "name": item["name"],
+                                     "amends": True, "description": item["description"]}
+                        out.append(amendment)
+                        elem_index[key] = amendment
                 else:
                     out.append(item)
                     elem_index[key] = item
@@ -486,15 +777,21 @@ class TokenAwarePromptGenerator:
 
     def refresh_cache_view(self):
         self.all_prompts_text.delete("1.0", tk.END)
+        parts = []
         for domain_id, objs in self.prompt_json_cache.items():
             dom_name = ARCHITECTURE_DOMAINS.get(domain_id, {}).get("name", domain_id)
-            preview = f"Domain: {dom_name} — {len(objs)} objects\n"
-            preview += json.dumps(objs[:5], indent=2, ensure_ascii=False) + ("\n ...\n\n" if len(objs) > 5 else "\n\n")
-            self.all_prompts_text.insert(tk.END, preview)
+            objs = apply_amendments(objs)
+            parts.append(f"Domain: {dom_name} — {len(objs)} objects\n")
+            parts.append(dumps_pretty(objs[:5]))
+            parts.append("\n ...\n\n" if len(objs) > 5 else "\n\n")
+        self.all_prompts_text.insert(tk.END, "".join(parts))
 
     def clear_generated_cache(self):
         if messagebox.askyesno("Confirm", "Clear all cached generated JSON?"):
             self.prompt_json_cache.clear()
+            self._domain_token_cache.clear()
+            self._json_indexes.clear()
+            self._summary_columns.clear()
             self.update_status("Cleared generated cache.")
             self.refresh_cache_view()
             self.estimate_current_prompt_tokens()
@@ -511,21 +808,53 @@ class TokenAwarePromptGenerator:
         stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
         export_root = os.path.join(folder, f"archimate_export_{stamp}")
         os.makedirs(export_root, exist_ok=True)
-        combined = []
-        for domain_id, objs in self.prompt_json_cache.items():
-            dom_name = ARCHITECTURE_DOMAINS.get(domain_id, {}).get("name", domain_id)
-            fname = f"{domain_id}.json"
-            path = os.path.join(export_root, fname)
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(objs, f, indent=2, ensure_ascii=False)
-            combined.extend(objs)
-        # Write combined
+        # The combined file is streamed object by object alongside the per-domain files,
+        # rather than collecting every object into one list first
         combined_path = os.path.join(export_root, "combined_model.json")
-        with open(combined_path, "w", encoding="utf-8") as f:
-            json.dump(combined, f, indent=2, ensure_ascii=False)
-        messagebox.showinfo("Exported", f"Exported {len(self.prompt_json_cache)} domain files + combined ({len(combined)} objects)\nFolder: {export_root}")
+        combined_count = 0
+        with open(combined_path, "w", encoding="utf-8", buffering=1 << 20) as combined:
+            combined.write("[")
+            for domain_id, objs in self.prompt_json_cache.items():
+                fname = f"{domain_id}.json"
+                path = os.path.join(export_root, fname)
+                objs = apply_amendments(objs)
+                with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+                    f.write(dumps_pretty(objs))
+                for o in objs:
+                    # Same layout as dumping the whole list with indent=2
+                    combined.write(",\n  " if combined_count else "\n  ")
+                    combined.write(dumps_pretty(o).replace("\n", "\n  "))
+                    combined_count += 1
+            combined.write("\n]" if combined_count else "]")
+        messagebox.showinfo("Exported", f"Exported {len(self.prompt_json_cache)} domain files + combined ({combined_count} objects)\nFolder: {export_root}")
         self.update_status(f"Exported JSON to {export_root}")
 
+    def _summary_columns_for(self, domain_id: str, objs: list) -> dict:
+        """
+        Element type, display name and one-sentence summary of a domain's objects as parallel lists.
+        The cached list is only ever appended to, so each object is summarised once and later calls
+        just extend the columns; an amendment rewrites the summary of the row it amends.
+        """
+        cols = self._summary_columns.get(domain_id)
+        if cols is None:
+            cols = self._summary_columns[domain_id] = {
+                "element_type": [], "name": [], "summary": [], "rows": {}, "seen": 0}
+        rows = cols["rows"]
+        for o in islice(objs, cols["seen"], None):
+            c = short_summary(o.get("description",""), max_chars=180)
+            key = (o.get("element_type"), o.get("name"))
+            if o.get("amends"):
+                if key in rows:
+                    cols["summary"][rows[key]] = c
+                continue
+            if "element_type" in o and o.get("name"):
+                rows[key] = len(cols["summary"])
+            cols["element_type"].append(o.get("element_type"))
+            cols["name"].append(o.get("name") or o.get("source_name") or "")
+            cols["summary"].append(c)
+        cols["seen"] = len(objs)
+        return cols
+
     def produce_compressed_summary(self):
         """
         Create a compressed summary prompt containing brief summaries for each domain's cached objects.
@@ -539,15 +868,10 @@ class TokenAwarePromptGenerator:
         for domain_id, objs in self.prompt_json_cache.items():
             dom_label = ARCHITECTURE_DOMAINS.get(domain_id,{}).get("name", domain_id)
             # Compact each object's description to 1 sentence
-            summaries = []
-            for o in objs:
-                name = o.get("name") or o.get("source_name") or ""
-                et = o.get("element_type") or o.get("element_type")
-                desc = o.get("description","")
-                c = short_summary(desc, max_chars=180)
-                summaries.append(f"{et} '{name}': {c}")
+            cols = self._summary_columns_for(domain_id, objs)
             # join a handful (limit tokens): include only top N items to control size
-            joined = "\n".join(summaries[:50])  # limit per domain
+            joined = "\n".join(f"{et} '{name}': {c}" for et, name, c in
+                               islice(zip(cols["element_type"], cols["name"], cols["summary"]), 50))  # limit per domain
             domain_summaries.append(f"DOMAIN: {dom_label}\n{joined}\n")
         compressed_body = "\n\n".join(domain_summaries)
         compressed_body = compact_text_for_prompt(compressed_body)
@@ -589,9 +913,22 @@ class TokenAwarePromptGenerator:
 
     # ---------- Sources tab helpers ----------
     def load_sources(self):
-        self.sources_tree.delete(*self.sources_tree.get_children())
+        """Sync the sources table with APPROVED_SOURCES, touching only rows that changed."""
+        rows = self._sources_rows
+        for key in [k for k in rows if k not in APPROVED_SOURCES]:
+            self.sources_tree.delete(rows.pop(key)[0])
         for key, s in APPROVED_SOURCES.items():
-            self.sources_tree.insert("", "end", values=(s.get("name",""), s.get("url",""), s.get("description","")), tags=(key,))
+            self._set_source_row(key, s)
+
+    def _set_source_row(self, key, s: dict):
+        values = (s.get("name",""), s.get("url",""), s.get("description",""))
+        row = self._sources_rows.get(key)
+        if row is None:
+            iid = self.sources_tree.insert("", "end", values=values, tags=(key,))
+            self._sources_rows[key] = (iid, values)
+        elif row[1] != values:
+            self.sources_tree.item(row[0], values=values)
+            self._sources_rows[key] = (row[0], values)
 
     def edit_selected_source(self):
         sel = self.sources_tree.selection()
@@ -631,7 +968,8 @@ class TokenAwarePromptGenerator:
                 save_approved_sources(APPROVED_SOURCES)
             except Exception:
                 pass
-            self.load_sources()
+            # Only this row changed
+            self._set_source_row(key, APPROVED_SOURCES[key])
             ewin.destroy()
             self.update_status("Saved approved source.")
 
@@ -640,10 +978,19 @@ class TokenAwarePromptGenerator:
     # ---------- Misc ----------
     def update_status(self, msg: str):
         self.status_var.set(msg)
+        # One idle-time refresh however many messages arrive before it runs
+        if not self._status_flush_pending:
+            self._status_flush_pending = True
+            self.root.after_idle(self._flush_status)
+
+    def _flush_status(self):
+        self._status_flush_pending = False
         self.root.update_idletasks()
 
 # ---------- Run App ----------
 if __name__ == "__main__":
+    load_token_cache()
     root = tk.Tk()
     app = TokenAwarePromptGenerator(root)
     root.mainloop()
+    save_token_cache()
@@ -3,15 +3,79 @@ VISUALIZATION ENGINE - Powerful graph visualizations using NetworkX and Matplotl
 """
 import networkx as nx
 import matplotlib.pyplot as plt
-import matplotlib.cm as cm
+import matplotlib.colors as mcolors
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from PIL import Image
 from typing import Dict, List, Any, Optional
 import numpy as np
+import math
+import heapq
+import io
+import operator
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import lru_cache
+
+# Top-to-bottom order of the layered layout; layer codes in _node_table index into this
+LAYER_ORDER = ('Motivation', 'Strategy', 'Business', 'Application', 'Technology', 'Implementation', 'Other')
+
+# ForceAtlas2 (compiled, Barnes-Hut) only beats spring_layout's O(N^2) steps on bigger graphs
+FA2_MIN_NODES = 500
+
+@lru_cache(maxsize=None)
+def _get_forceatlas2():
+    """ForceAtlas2 layout class on first use - None when neither fa2_modified nor fa2 is installed"""
+    try:
+        from fa2_modified import ForceAtlas2
+        return ForceAtlas2
+    except ImportError:
+        pass
+    try:
+        from fa2 import ForceAtlas2
+        return ForceAtlas2
+    except ImportError:
+        return None
+
+# Layouts kept per (layout, graph) - enough for the model graph plus a few filtered views
+LAYOUT_CACHE_SIZE = 8
+
+# Per-layer impact averages kept for the latest few score sets
+LAYER_IMPACT_CACHE_SIZE = 8
+
+# One centrality panel of export_centrality_png, in inches at CENTRALITY_PANEL_DPI
+CENTRALITY_PANEL_SIZE = (8, 6)
+CENTRALITY_PANEL_DPI = 100
+
+def _draw_centrality_panel(ax, measure, names, values, colors):
+    """Bar chart of the top nodes for one centrality measure"""
+    bars = ax.barh(names, values, color=colors, alpha=0.8)
+    ax.set_title(f'Top 20 Nodes by {measure.title()} Centrality')
+    ax.set_xlabel('Centrality Score')
+    
+    # Add value labels
+    ax.bar_label(bars, fmt='%.3f', padding=2, fontsize=8)
+
+def _render_centrality_panel(measure, names, values, colors) -> bytes:
+    """PNG of one centrality panel on its own Agg figure - module level so worker processes
+    can run it"""
+    fig = Figure(figsize=CENTRALITY_PANEL_SIZE, dpi=CENTRALITY_PANEL_DPI)
+    FigureCanvasAgg(fig)
+    _draw_centrality_panel(fig.add_subplot(111), measure, names, values, colors)
+    fig.tight_layout()
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png')
+    return buf.getvalue()
 
 class GraphVisualizer:
-    def __init__(self, graph_model):
+    def __init__(self, graph_model, interactive: bool = True):
         self.graph = graph_model.graph
         self.model = graph_model
+        # False for headless export: plots go to standalone Agg figures, not pyplot's current one
+        self.interactive = interactive
         self.colors = {
             'Motivation': '#e74c3c',
             'Strategy': '#9b59b6', 
@@ -21,41 +85,294 @@ class GraphVisualizer:
             'Implementation': '#1abc9c',
             'Other': '#95a5a6'
         }
+        # Colours converted to RGBA once, rather than by matplotlib on every plot
+        self._layer_rgba = {layer: mcolors.to_rgba(color) for layer, color in self.colors.items()}
+        self._default_rgba = mcolors.to_rgba('#95a5a6')
+        # RGBA row per layer code, with unknown layers (code len(LAYER_ORDER)) in grey
+        self._layer_palette = np.array([self._layer_rgba.get(layer, self._default_rgba) for layer in LAYER_ORDER]
+                                       + [self._default_rgba])
+        self._table_cache = None
+        self._last_pos = None  # Previous force layout, the warm start for the next one
+        self._layout_cache = {}  # (layout name, id(graph)) -> (graph, (nodes, edges), pos)
+        self._last_plots = {}  # plot name -> (signature, fig, its artists when drawn)
+        self._layer_impact_cache = {}  # tuple(impact_scores.items()) -> _impact_by_layer result
+    
+    def invalidate_caches(self):
+        """Forget per-graph data - call after mutating the model graph in place"""
+        self._table_cache = None
+        self._layout_cache.clear()
+        self._last_plots.clear()
+    
+    def _cached_layout(self, name: str, compute):
+        """Positions from compute() for the current graph, reused until the graph changes
+        
+        Replots that only change sizes or colours (new impact scores) skip the layout step.
+        """
+        graph = self.graph
+        key = (name, id(graph))
+        version = (graph.number_of_nodes(), graph.number_of_edges())
+        entry = self._layout_cache.get(key)
+        if entry is None or entry[0] is not graph or entry[1] != version:
+            entry = (graph, version, compute())
+            self._layout_cache.pop(key, None)
+            self._layout_cache[key] = entry
+            while len(self._layout_cache) > LAYOUT_CACHE_SIZE:
+                del self._layout_cache[next(iter(self._layout_cache))]
+        return entry[2]
+    
+    def _node_table(self):
+        """Per-node columns for the graph being plotted, rebuilt when the graph changes
+        
+        Returns (node_ids, layer_code, names, importance) in graph node order: layer_code is
+        an index into LAYER_ORDER (len(LAYER_ORDER) for unknown layers), names the display
+        names as fixed-width '<U20' strings (the longest any label shows) and importance the
+        importance_score (0.5 when unset).
+        """
+        graph = self.graph
+        key = (graph.number_of_nodes(), graph.number_of_edges())
+        cache = self._table_cache
+        if cache is None or cache[0] is not graph or cache[1] != key:
+            codes = {layer: i for i, layer in enumerate(LAYER_ORDER)}
+            n = key[0]
+            node_ids = np.empty(n, dtype=object)
+            names = [None] * n
+            layer_code = np.empty(n, dtype=np.int32)
+            importance = np.empty(n, dtype=float)
+            # One pass over the node dicts instead of one per attribute
+            for i, (node, data) in enumerate(graph.nodes(data=True)):
+                node_ids[i] = node
+                names[i] = data.get('name', node)
+                layer_code[i] = codes.get(data.get('layer', 'Other'), len(LAYER_ORDER))
+                importance[i] = data.get('importance_score', 0.5)
+            names = np.array(names, dtype='<U20').reshape(n)
+            index = {node: i for i, node in enumerate(node_ids)}
+            m = key[1]
+            src = np.empty(m, dtype=np.intp)
+            dst = np.empty(m, dtype=np.intp)
+            weight = np.empty(m, dtype=float)
+            for i, (u, v, w) in enumerate(graph.edges(data='weight', default=0.5)):
+                src[i] = index[u]
+                dst[i] = index[v]
+                weight[i] = w
+            cache = self._table_cache = (graph, key, (node_ids, layer_code, names, importance), index,
+                                         (src, dst, weight))
+            self._layer_impact_cache.clear()
+        return cache[2]
+    
+    def _node_index(self) -> Dict[str, int]:
+        """{node: row} into the _node_table arrays"""
+        self._node_table()
+        return self._table_cache[3]
+    
+    def _edge_table(self):
+        """(src, dst, weight) per edge in graph edge order - src/dst are _node_table rows and
+        weight the edge weight (0.5 when unset)"""
+        self._node_table()
+        return self._table_cache[4]
+    
+    def _plot_signature(self, impact_scores, title):
+        """What a plot depends on - the graph (and its size), the scores and the title"""
+        graph = self.graph
+        scores = frozenset(impact_scores.items()) if impact_scores else frozenset()
+        return (graph, graph.number_of_nodes(), graph.number_of_edges(), title, scores)
+    
+    def _reuse_plot(self, name: str, signature):
+        """The figure name last drew for the same signature, if nothing has redrawn it since
+        
+        Resize events and mode switches replot with unchanged inputs; those skip matplotlib.
+        """
+        entry = self._last_plots.get(name)
+        if entry is None or entry[0] != signature:
+            return None
+        fig = entry[1]
+        # The dashboard shares the pyplot figure and may have cleared or redrawn its axes
+        if (self.interactive and fig is not plt.gcf()) or self._artists(fig) != entry[2]:
+            del self._last_plots[name]
+            return None
+        return fig
+    
+    def _remember_plot(self, name: str, signature, fig):
+        self._last_plots[name] = (signature, fig, self._artists(fig))
+        return fig
+    
+    @staticmethod
+    def _artists(fig):
+        return tuple(tuple(ax.get_children()) for ax in fig.axes)
+    
+    def _new_figure(self):
+        """Figure for the next plot - the current pyplot figure, cleared, when interactive (the
+        dashboard embeds it), otherwise a fresh Figure on an Agg canvas that skips pyplot"""
+        if self.interactive:
+            fig = plt.gcf()
+            fig.clf()
+            return fig
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        return fig
+    
+    def _draw_fast(self, ax, pos, node_sizes, node_colors, edge_widths=1.0, edge_alpha=0.3, nodes=None):
+        """Draw all edges as one LineCollection and the nodes as one scatter
+        
+        nx.draw_networkx_edges makes an artist per edge; this keeps the artist count constant.
+        nodes defaults to every node in graph order (matching sizes/colours from _node_table).
+        Returns (edge_collection, node_collection).
+        """
+        node_ids = self._node_table()[0]
+        index = self._node_index()
+        src, dst, _ = self._edge_table()
+        # float32 is what Agg rasterizes with anyway; half the bytes through the collections
+        pts = np.array([pos[node] for node in node_ids], dtype=np.float32).reshape(-1, 2)
+        edge_lc = LineCollection(np.stack([pts[src], pts[dst]], axis=1), linewidths=edge_widths,
+                                 colors='k', alpha=edge_alpha, zorder=1)
+        ax.add_collection(edge_lc)
+        if nodes is not None:
+            pts = pts[[index[node] for node in nodes]].reshape(-1, 2)
+        node_pc = ax.scatter(pts[:, 0], pts[:, 1], s=node_sizes, c=node_colors, alpha=0.8, zorder=2)
+        if len(pts):
+            # Pad the data limits by 5% like nx.draw_networkx_edges, so big markers and labels
+            # at the edges of the layout aren't clipped
+            lo, hi = pts.min(axis=0), pts.max(axis=0)
+            pad = 0.05 * (hi - lo)
+            ax.update_datalim((lo - pad, hi + pad))
+        ax.autoscale_view()
+        return edge_lc, node_pc
+    
+    def force_layout(self):
+        """Force-directed positions for the current graph, computed once until it changes"""
+        return self._cached_layout('force', self._compute_force_layout)
+    
+    def _compute_force_layout(self):
+        """Force-directed positions for the current graph - ForceAtlas2 on large graphs when
+        available (warm-started from the previous layout), spring_layout otherwise"""
+        graph = self.graph
+        pos = None
+        ForceAtlas2 = _get_forceatlas2() if graph.number_of_nodes() >= FA2_MIN_NODES else None
+        if ForceAtlas2 is not None:
+            seed = self._last_pos
+            if seed is not None and not all(node in seed for node in graph):
+                seed = None
+            try:
+                fa2 = ForceAtlas2(barnesHutOptimize=True, barnesHutTheta=1.2, scalingRatio=2.0,
+                                  gravity=1.0, verbose=False)
+                pos = fa2.forceatlas2_networkx_layout(graph, pos=seed, iterations=50, weight_attr='weight')
+            except Exception:
+                # e.g. the original fa2 package, which doesn't work with networkx 3
+                pos = None
+        if pos is None:
+            pos = nx.spring_layout(graph, weight='weight', k=1, iterations=50)
+        self._last_pos = pos
+        return pos
+    
+    def _labels(self, mask, width: int) -> Dict[str, str]:
+        """{node: name cut to width characters} for the nodes selected by mask (... for all)"""
+        node_ids, _, names, _ = self._node_table()
+        return dict(zip(node_ids[mask], names[mask].astype(f'<U{width}')))
+    
+    def _compute_spectral_layout(self):
+        """Spectral (Laplacian eigenvector) positions, which pull clusters apart
+        
+        A disconnected graph gets one embedding per component, placed side by side on a grid,
+        since a single embedding collapses onto whichever components the eigenvectors pick.
+        """
+        graph = self.graph
+        find_components = nx.weakly_connected_components if graph.is_directed() else nx.connected_components
+        components = sorted(find_components(graph), key=len, reverse=True)
+        if len(components) <= 1:
+            return nx.spectral_layout(graph, weight='weight')
+        cols = math.ceil(math.sqrt(len(components)))
+        pos = {}
+        for i, nodes in enumerate(components):
+            center = np.array([i % cols, -(i // cols)], dtype=float)
+            if len(nodes) <= 2:
+                # spectral_layout ignores center and scale for two nodes or fewer
+                offsets = ((0.0, 0.0),) if len(nodes) == 1 else ((-0.2, 0.0), (0.2, 0.0))
+                pos.update((node, center + offset) for node, offset in zip(nodes, offsets))
+                continue
+            pos.update(nx.spectral_layout(graph.subgraph(nodes), weight='weight', scale=0.4,
+                                          center=center))
+        return pos
+    
+    def _impact_by_layer(self, impact_scores: Dict[str, float]):
+        """Average positive impact per layer, as (layers, averages, colors)
+        
+        Layers come in the order they first appear in impact_scores. Group sums and counts are
+        two bincounts over the layer codes rather than a Python list and np.mean per layer.
+        Results are cached per score set until the graph changes, so the impact analysis and
+        heatmap of the same scores share one computation.
+        """
+        _, layer_code, _, _ = self._node_table()
+        key = tuple(impact_scores.items())
+        result = self._layer_impact_cache.pop(key, None)
+        if result is None:
+            result = self._compute_impact_by_layer(layer_code, impact_scores)
+            while len(self._layer_impact_cache) >= LAYER_IMPACT_CACHE_SIZE:
+                del self._layer_impact_cache[next(iter(self._layer_impact_cache))]
+        self._layer_impact_cache[key] = result
+        return result
+    
+    def _compute_impact_by_layer(self, layer_code, impact_scores: Dict[str, float]):
+        index = self._node_index()
+        n = len(impact_scores)
+        codes = layer_code[np.fromiter((index[node] for node in impact_scores), dtype=np.intp, count=n)]
+        scores = np.fromiter(impact_scores.values(), dtype=float, count=n)
+        positive = scores > 0
+        codes, scores = codes[positive], scores[positive]
+        n_codes = len(LAYER_ORDER) + 1
+        sums = np.bincount(codes, weights=scores, minlength=n_codes)
+        counts = np.bincount(codes, minlength=n_codes)
+        present, first_seen = np.unique(codes, return_index=True)
+        present = present[np.argsort(first_seen)]
+        # Unknown layers (code len(LAYER_ORDER)) are shown as 'Other'
+        layers = tuple(LAYER_ORDER[min(code, len(LAYER_ORDER) - 1)] for code in present.tolist())
+        colors = tuple(self._layer_rgba.get(layer, self._default_rgba) for layer in layers)
+        return layers, tuple((sums[present] / counts[present]).tolist()), colors
+    
+    def _impact_vector(self, node_ids, impact_scores: Dict[str, float]) -> np.ndarray:
+        """Impact score per node in node_ids order (0 when unscored)"""
+        return np.fromiter((impact_scores.get(node, 0) for node in node_ids), dtype=float, count=len(node_ids))
+    
+    @contextmanager
+    def using_graph(self, graph):
+        """Temporarily plot a different graph (e.g. a filtered subgraph view)"""
+        original = self.graph
+        self.graph = graph
+        try:
+            yield self
+        finally:
+            self.graph = original
     
     def create_layered_layout(self, impact_scores: Dict[str, float] = None):
         """Create a layered layout based on architecture layers"""
-        pos = {}
-        layer_nodes = defaultdict(list)
-        
-        # Group nodes by layer
-        for node in self.graph.nodes():
-            layer = self.graph.nodes[node].get('layer', 'Other')
-            layer_nodes[layer].append(node)
+        node_ids, layer_code, _, _ = self._node_table()
+        n_layers = len(LAYER_ORDER)
+        layer_height = 1.0 / n_layers
         
-        # Position nodes in layers
-        layers_order = ['Motivation', 'Strategy', 'Business', 'Application', 'Technology', 'Implementation', 'Other']
-        layer_height = 1.0 / len(layers_order)
-        
-        for i, layer in enumerate(layers_order):
-            if layer in layer_nodes:
-                nodes = layer_nodes[layer]
-                y_pos = 1.0 - (i * layer_height) - layer_height/2
-                
-                # Sort nodes by importance for better layout
-                if impact_scores:
-                    nodes.sort(key=lambda x: impact_scores.get(x, 0), reverse=True)
-                
-                for j, node in enumerate(nodes):
-                    x_pos = (j + 1) / (len(nodes) + 1)
-                    pos[node] = (x_pos, y_pos)
-        
-        return pos
+        # Group nodes by layer (graph order within a layer), most impacted first when scored;
+        # both sorts are stable, so ties keep graph order
+        if impact_scores:
+            order = np.lexsort((-self._impact_vector(node_ids, impact_scores), layer_code))
+        else:
+            order = np.argsort(layer_code, kind='stable')
+        # Unknown layers have no row in the layout
+        order = order[layer_code[order] < n_layers]
+        codes = layer_code[order]
+        
+        # Position nodes in layers: rank within the layer spreads them along x
+        counts = np.bincount(codes, minlength=n_layers)
+        rank = np.arange(len(codes)) - np.searchsorted(codes, codes, side='left')
+        x_pos = (rank + 1) / (counts[codes] + 1)
+        y_pos = 1.0 - (codes * layer_height) - layer_height/2
+        
+        return dict(zip(node_ids[order].tolist(), zip(x_pos.tolist(), y_pos.tolist())))
     
     def plot_impact_analysis(self, impact_scores: Dict[str, float], title: str = "Impact Analysis"):
         """Create a visualization of impact analysis results - FIXED for dashboard"""
         # Use current figure instead of creating new one
-        fig = plt.gcf()
-        fig.clf()
+        signature = self._plot_signature(impact_scores, title)
+        fig = self._reuse_plot('impact', signature)
+        if fig is not None:
+            return fig
+        fig = self._new_figure()
         ax1 = fig.add_subplot(121)  # Left subplot
         ax2 = fig.add_subplot(122)  # Right subplot
         
@@ -63,161 +380,155 @@ class GraphVisualizer:
         pos = self.create_layered_layout(impact_scores)
         
         # Draw nodes with size based on impact
-        node_sizes = [impact_scores.get(node, 0) * 2000 + 100 for node in self.graph.nodes()]
-        node_colors = [self.colors.get(self.graph.nodes[node].get('layer', 'Other'), '#95a5a6') 
-                      for node in self.graph.nodes()]
-        
-        nx.draw_networkx_nodes(self.graph, pos, node_size=node_sizes, 
-                              node_color=node_colors, alpha=0.8, ax=ax1)
+        node_ids, layer_code, _, _ = self._node_table()
+        impact_vec = self._impact_vector(node_ids, impact_scores)
+        node_sizes = impact_vec * 2000 + 100
+        node_colors = self._layer_palette[layer_code]
         
-        # Draw edges with transparency based on weight
-        edge_weights = [self.graph[u][v].get('weight', 0.5) * 2 for u, v in self.graph.edges()]
-        nx.draw_networkx_edges(self.graph, pos, alpha=0.3, width=edge_weights, ax=ax1)
+        # Edges with transparency, width based on weight
+        edge_weights = self._edge_table()[2] * 2
+        self._draw_fast(ax1, pos, node_sizes, node_colors, edge_weights)
         
         # Draw labels for important nodes only
-        important_nodes = [node for node, score in impact_scores.items() if score > 0.1]
-        labels = {node: self.graph.nodes[node].get('name', node)[:15] 
-                 for node in important_nodes}
+        important = impact_vec > 0.1
+        labels = self._labels(important, 15)
         nx.draw_networkx_labels(self.graph, pos, labels, font_size=8, ax=ax1)
         
         ax1.set_title(f"{title}\nNetwork View")
         ax1.axis('off')
         
         # Plot 2: Impact distribution by layer
-        layer_impacts = defaultdict(list)
-        for node, score in impact_scores.items():
-            if score > 0:
-                layer = self.graph.nodes[node].get('layer', 'Other')
-                layer_impacts[layer].append(score)
+        layers, avg_impacts, colors = self._impact_by_layer(impact_scores)
         
-        layers = []
-        avg_impacts = []
-        for layer, impacts in layer_impacts.items():
-            layers.append(layer)
-            avg_impacts.append(np.mean(impacts) if impacts else 0)
-        
-        colors = [self.colors.get(layer, '#95a5a6') for layer in layers]
         bars = ax2.bar(layers, avg_impacts, color=colors, alpha=0.8)
         ax2.set_title('Average Impact by Layer')
         ax2.set_ylabel('Impact Score')
         ax2.tick_params(axis='x', rotation=45)
         
         # Add value labels on bars
-        for bar in bars:
-            height = bar.get_height()
-            ax2.text(bar.get_x() + bar.get_width()/2., height,
-                    f'{height:.2f}', ha='center', va='bottom')
+        ax2.bar_label(bars, fmt='%.2f', padding=2)
         
-        plt.tight_layout()
-        return fig
+        fig.tight_layout()
+        return self._remember_plot('impact', signature, fig)
     
     def plot_centrality_analysis(self, centrality_scores: Dict[str, Dict]):
         """Visualize different centrality measures - FIXED for dashboard"""
-        fig = plt.gcf()
-        fig.clf()
+        fig = self._new_figure()
         
-        measures = list(centrality_scores.keys())[:4]
+        panels = self._centrality_panels(centrality_scores)
         rows = 2
         cols = 2
         
-        for i, measure in enumerate(measures):
+        for i, panel in enumerate(panels):
             ax = fig.add_subplot(rows, cols, i+1)
-            
-            if measure in centrality_scores:
-                scores = centrality_scores[measure]
-                
-                # Get top 20 nodes by centrality
-                top_nodes = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:20]
-                nodes, values = zip(*top_nodes)
-                
-                # Get node names and layers for coloring
-                node_names = [self.graph.nodes[node].get('name', node)[:20] for node in nodes]
-                node_layers = [self.graph.nodes[node].get('layer', 'Other') for node in nodes]
-                colors = [self.colors.get(layer, '#95a5a6') for layer in node_layers]
-                
-                bars = ax.barh(node_names, values, color=colors, alpha=0.8)
-                ax.set_title(f'Top 20 Nodes by {measure.title()} Centrality')
-                ax.set_xlabel('Centrality Score')
-                
-                # Add value labels
-                for bar in bars:
-                    width = bar.get_width()
-                    ax.text(width, bar.get_y() + bar.get_height()/2.,
-                            f'{width:.3f}', ha='left', va='center', fontsize=8)
+            _draw_centrality_panel(ax, *panel)
         
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
     
+    def _centrality_panels(self, centrality_scores: Dict[str, Dict]):
+        """(measure, names, values, colors) of the top 20 nodes for up to four measures"""
+        panels = []
+        for measure in list(centrality_scores.keys())[:4]:
+            scores = centrality_scores[measure]
+            
+            # Get top 20 nodes by centrality (same order as a full descending sort)
+            top_nodes = heapq.nlargest(20, scores.items(), key=operator.itemgetter(1))
+            nodes, values = zip(*top_nodes)
+            
+            # Get node names and layers for coloring
+            node_names = [self.graph.nodes[node].get('name', node)[:20] for node in nodes]
+            node_layers = [self.graph.nodes[node].get('layer', 'Other') for node in nodes]
+            colors = [self._layer_rgba.get(layer, self._default_rgba) for layer in node_layers]
+            panels.append((measure, node_names, list(values), colors))
+        return panels
+    
+    def export_centrality_png(self, centrality_scores: Dict[str, Dict], output_path: str, workers: int = 4):
+        """Export the centrality panels as one 2x2 PNG without pyplot, e.g. for reports
+        
+        Each panel renders on its own Agg figure in a worker process and the PNGs are pasted
+        together with PIL (which matplotlib already depends on).
+        """
+        panels = self._centrality_panels(centrality_scores)
+        if not panels:
+            print("⚠️ No centrality scores to export")
+            return
+        
+        try:
+            with ProcessPoolExecutor(max_workers=max(1, min(workers, len(panels)))) as executor:
+                pngs = list(executor.map(_render_centrality_panel, *zip(*panels)))
+        except (OSError, BrokenProcessPool):
+            # No worker processes here (sandboxed or frozen app) - render in this process
+            pngs = [_render_centrality_panel(*panel) for panel in panels]
+        
+        images = [Image.open(io.BytesIO(png)) for png in pngs]
+        width, height = images[0].size
+        sheet = Image.new('RGB', (width * 2, height * 2), 'white')
+        for i, image in enumerate(images):
+            sheet.paste(image, ((i % 2) * width, (i // 2) * height))
+        sheet.save(output_path, format='PNG')
+        print(f"✅ Centrality chart exported to: {output_path}")
+    
     def plot_community_structure(self, communities: Dict[int, List[str]]):
         """Visualize detected communities in the architecture - FIXED for dashboard"""
-        fig = plt.gcf()
-        fig.clf()
+        fig = self._new_figure()
         ax = fig.add_subplot(111)
         
-        # Create a colormap for communities
-        cmap = cm.get_cmap('tab20', len(communities))
+        # One tab20 colour per community, looked up once as an RGBA array
+        # (pyplot.get_cmap - matplotlib.cm.get_cmap is gone from matplotlib 3.9)
+        cmap = plt.get_cmap('tab20', max(1, len(communities)))
+        community_rgba = cmap(np.fromiter(communities.keys(), dtype=int, count=len(communities))).reshape(-1, 4)
         
-        # Create spring layout
-        pos = nx.spring_layout(self.graph, weight='weight', k=1, iterations=50)
+        # Spectral layout - separates clusters without force-directed iterations
+        pos = self._cached_layout('spectral', self._compute_spectral_layout)
         
-        # Draw nodes colored by community
-        for comm_id, nodes in communities.items():
-            nx.draw_networkx_nodes(self.graph, pos, nodelist=nodes,
-                                 node_color=[cmap(comm_id)], node_size=100,
-                                 alpha=0.8, ax=ax)
-        
-        # Draw edges
-        nx.draw_networkx_edges(self.graph, pos, alpha=0.2, ax=ax)
+        # Draw nodes colored by community, and the edges
+        members = [node for nodes in communities.values() for node in nodes]
+        member_colors = np.repeat(community_rgba, [len(nodes) for nodes in communities.values()], axis=0)
+        self._draw_fast(ax, pos, 100, member_colors, edge_alpha=0.2, nodes=members)
         
         # Add legend
         from matplotlib.patches import Patch
-        legend_elements = [Patch(facecolor=cmap(i), label=f'Community {i+1} ({len(nodes)} nodes)')
-                          for i, nodes in communities.items()]
+        legend_elements = [Patch(facecolor=rgba, label=f'Community {i+1} ({len(nodes)} nodes)')
+                          for rgba, (i, nodes) in zip(community_rgba, communities.items())]
         ax.legend(handles=legend_elements, loc='upper right')
         
         ax.set_title('Architecture Community Structure')
         ax.axis('off')
         
-        plt.tight_layout()
+        fig.tight_layout()
         return fig
     
     def plot_force_directed_layout(self, impact_scores: Dict[str, float] = None, title: str = "Force-Directed Layout"):
         """Create a force-directed layout visualization - FIXED for dashboard"""
-        fig = plt.gcf()
-        fig.clf()
+        signature = self._plot_signature(impact_scores, title)
+        fig = self._reuse_plot('force', signature)
+        if fig is not None:
+            return fig
+        fig = self._new_figure()
         ax = fig.add_subplot(111)
         
-        # Use spring layout for force-directed effect
-        pos = nx.spring_layout(self.graph, weight='weight', k=1, iterations=50)
+        # Force-directed layout (ForceAtlas2 or spring)
+        pos = self.force_layout()
         
         # Node sizes based on impact or importance
+        node_ids, layer_code, _, importance = self._node_table()
         if impact_scores:
-            node_sizes = [impact_scores.get(node, 0) * 3000 + 100 for node in self.graph.nodes()]
+            impact_vec = self._impact_vector(node_ids, impact_scores)
+            node_sizes = impact_vec * 3000 + 100
         else:
-            node_sizes = [self.graph.nodes[node].get('importance_score', 0.5) * 2000 + 100 
-                         for node in self.graph.nodes()]
+            node_sizes = importance * 2000 + 100
         
         # Node colors by layer
-        node_colors = [self.colors.get(self.graph.nodes[node].get('layer', 'Other'), '#95a5a6') 
-                      for node in self.graph.nodes()]
-        
-        # Draw the graph
-        nx.draw_networkx_nodes(self.graph, pos, node_size=node_sizes, 
-                              node_color=node_colors, alpha=0.8, ax=ax)
+        node_colors = self._layer_palette[layer_code]
         
-        # Draw edges with weights
-        edge_weights = [self.graph[u][v].get('weight', 0.5) * 2 for u, v in self.graph.edges()]
-        nx.draw_networkx_edges(self.graph, pos, alpha=0.3, width=edge_weights, ax=ax)
+        # Draw the graph, edges with weights
+        edge_weights = self._edge_table()[2] * 2
+        self._draw_fast(ax, pos, node_sizes, node_colors, edge_weights)
         
         # Draw labels for important nodes only
-        if impact_scores:
-            important_nodes = [node for node, score in impact_scores.items() if score > 0.1]
-        else:
-            important_nodes = [node for node in self.graph.nodes() 
-                              if self.graph.nodes[node].get('importance_score', 0) > 0.7]
-        
-        labels = {node: self.graph.nodes[node].get('name', node)[:15] 
-                 for node in important_nodes}
+        important = impact_vec > 0.1 if impact_scores else importance > 0.7
+        labels = self._labels(important, 15)
         nx.draw_networkx_labels(self.graph, pos, labels, font_size=8, ax=ax)
         
         ax.set_title(title)
@@ -229,77 +540,67 @@ class GraphVisualizer:
                           for layer, color in self.colors.items()]
         ax.legend(handles=legend_elements, loc='upper right')
         
-        plt.tight_layout()
-        return fig
+        fig.tight_layout()
+        return self._remember_plot('force', signature, fig)
     
     def plot_layered_layout(self, impact_scores: Dict[str, float] = None, title: str = "Layered Architecture Layout"):
         """Create a traditional layered architecture visualization - FIXED for dashboard"""
-        fig = plt.gcf()
-        fig.clf()
+        signature = self._plot_signature(impact_scores, title)
+        fig = self._reuse_plot('layered', signature)
+        if fig is not None:
+            return fig
+        fig = self._new_figure()
         ax = fig.add_subplot(111)
         
         # Use the existing layered layout method
         pos = self.create_layered_layout(impact_scores)
         
         # Node sizes based on impact or importance
+        node_ids, layer_code, _, importance = self._node_table()
         if impact_scores:
-            node_sizes = [impact_scores.get(node, 0) * 3000 + 100 for node in self.graph.nodes()]
+            impact_vec = self._impact_vector(node_ids, impact_scores)
+            node_sizes = impact_vec * 3000 + 100
         else:
-            node_sizes = [self.graph.nodes[node].get('importance_score', 0.5) * 2000 + 100 
-                         for node in self.graph.nodes()]
+            node_sizes = importance * 2000 + 100
         
         # Node colors by layer
-        node_colors = [self.colors.get(self.graph.nodes[node].get('layer', 'Other'), '#95a5a6') 
-                      for node in self.graph.nodes()]
-        
-        # Draw the graph
-        nx.draw_networkx_nodes(self.graph, pos, node_size=node_sizes, 
-                              node_color=node_colors, alpha=0.8, ax=ax)
+        node_colors = self._layer_palette[layer_code]
         
-        # Draw edges
-        edge_weights = [self.graph[u][v].get('weight', 0.5) * 2 for u, v in self.graph.edges()]
-        nx.draw_networkx_edges(self.graph, pos, alpha=0.3, width=edge_weights, ax=ax)
+        # Draw the graph and its edges
+        edge_weights = self._edge_table()[2] * 2
+        self._draw_fast(ax, pos, node_sizes, node_colors, edge_weights)
         
         # Draw labels for all nodes in layered layout (more space)
-        labels = {node: self.graph.nodes[node].get('name', node)[:20] 
-                 for node in self.graph.nodes()}
+        labels = self._labels(..., 20)
         nx.draw_networkx_labels(self.graph, pos, labels, font_size=7, ax=ax)
         
         ax.set_title(title)
         ax.axis('off')
         
-        plt.tight_layout()
-        return fig
+        fig.tight_layout()
+        return self._remember_plot('layered', signature, fig)
     
     def plot_impact_heatmap(self, impact_scores: Dict[str, float], title: str = "Impact Heatmap"):
         """Create a heatmap visualization of impacts across layers and node types - FIXED for dashboard"""
-        fig = plt.gcf()
-        fig.clf()
+        signature = self._plot_signature(impact_scores, title)
+        fig = self._reuse_plot('heatmap', signature)
+        if fig is not None:
+            return fig
+        fig = self._new_figure()
         ax1 = fig.add_subplot(121)  # Left subplot
         ax2 = fig.add_subplot(122)  # Right subplot
         
         # Plot 1: Impact distribution by layer
-        layer_impacts = defaultdict(list)
-        for node, score in impact_scores.items():
-            if score > 0:
-                layer = self.graph.nodes[node].get('layer', 'Other')
-                layer_impacts[layer].append(score)
-        
-        layers = list(layer_impacts.keys())
-        avg_impacts = [np.mean(impacts) if impacts else 0 for impacts in layer_impacts.values()]
+        layers, avg_impacts, colors = self._impact_by_layer(impact_scores)
         
         # Create bar chart
-        colors = [self.colors.get(layer, '#95a5a6') for layer in layers]
         bars = ax1.bar(layers, avg_impacts, color=colors, alpha=0.8)
         ax1.set_title('Average Impact by Layer')
         ax1.set_ylabel('Impact Score')
         ax1.tick_params(axis='x', rotation=45)
         
         # Add value labels on bars
-        for bar in bars:
-            height = bar.get_height()
-            ax1.text(bar.get_x() + bar.get_width()/2., height,
-                    f'{height:.3f}', ha='center', va='bottom')
+        ax1.bar_label(bars, fmt='%.3f', padding=2)
         
         # Plot 2: Impact distribution by node type
         type_impacts = defaultdict(list)
@@ -318,19 +619,18 @@ class GraphVisualizer:
         
         # Create horizontal bar chart
         y_pos = np.arange(len(types))
-        ax2.barh(y_pos, avg_type_impacts, alpha=0.8, color='skyblue')
+        type_bars = ax2.barh(y_pos, avg_type_impacts, alpha=0.8, color='skyblue')
         ax2.set_yticks(y_pos)
         ax2.set_yticklabels(types, fontsize=9)
         ax2.set_xlabel('Average Impact Score')
         ax2.set_title('Top 10 Node Types by Impact')
         
         # Add value labels
-        for i, v in enumerate(avg_type_impacts):
-            ax2.text(v, i, f' {v:.3f}', va='center', fontsize=8)
+        ax2.bar_label(type_bars, fmt='%.3f', padding=2, fontsize=8)
         
-        plt.suptitle(title, fontsize=16)
-        plt.tight_layout()
-        return fig
+        fig.suptitle(title, fontsize=16)
+        fig.tight_layout()
+        return self._remember_plot('heatmap', signature, fig)
     
     def export_interactive_html(self, impact_scores: Dict[str, float], output_path: str):
         """Export an interactive HTML visualization using pyvis"""
@@ -359,15 +659,26 @@ class GraphVisualizer:
                     borderWidth=2
                 )
             
-            # Add edges
+            # Add edges - appended straight to net.edges in the form add_edge produces, since
+            # add_edge rescans every node and edge added so far on each call
+            seen_pairs = set()
+            edges = []
             for u, v, data in self.graph.edges(data=True):
-                net.add_edge(
-                    u, v,
-                    title=f"Type: {data.get('relationship_type', 'Unknown')}\n"
-                          f"Weight: {data.get('weight', 0.5):.2f}",
-                    width=data.get('weight', 0.5) * 3,
-                    color='rgba(100,100,100,0.5)'
-                )
+                # The network is undirected: add_edge keeps only the first edge between two nodes
+                pair = frozenset((u, v))
+                if pair in seen_pairs:
+                    continue
+                seen_pairs.add(pair)
+                weight = data.get('weight', 0.5)
+                edges.append({
+                    'title': f"Type: {data.get('relationship_type', 'Unknown')}\n"
+                             f"Weight: {weight:.2f}",
+                    'width': weight * 3,
+                    'color': 'rgba(100,100,100,0.5)',
+                    'from': u,
+                    'to': v,
+                })
+            net.edges.extend(edges)
             
             # Configure physics for better layout
             net.set_options("""